@@ -7,10 +7,20 @@ import os
 import datetime
 import signal
 import sys
+import re
 import queue
+import collections
+import functools
 import traceback
+import concurrent.futures
+import atexit
+import asyncio
+import socket
+from enum import IntEnum
+import requests
 from dotenv import load_dotenv
-from logging.handlers import RotatingFileHandler
+from telebot.apihelper import ApiTelegramException
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener, MemoryHandler
 
 # Import do sistema de mensagens programadas (para cadastros automáticos)
 try:
@@ -20,6 +30,13 @@ except ImportError:
     HAS_SCHEDULER = False
     print("Aviso: Módulo de mensagens programadas não encontrado")
 
+# psutil é opcional: sem ele, /status e /monitor omitem os recursos do sistema
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
 # Configuração de logging avançada para monitoramento 24/7
 LOG_FILENAME = 'bacbo_bot.log'
 os.makedirs('logs', exist_ok=True)
@@ -34,15 +51,45 @@ console_handler.setLevel(logging.INFO)
 console_format = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 console_handler.setFormatter(console_format)
 
-# Handler para arquivo com rotação (10 MB por arquivo, máximo 5 arquivos)
-file_handler = RotatingFileHandler(os.path.join('logs', LOG_FILENAME), maxBytes=10*1024*1024, backupCount=5)
-file_handler.setLevel(logging.DEBUG)  # Mais detalhado no arquivo
+# Handler para arquivo com rotação (5 MB por arquivo, máximo 2 backups)
+file_handler = RotatingFileHandler(os.path.join('logs', LOG_FILENAME), maxBytes=5*1024*1024, backupCount=2)
+file_handler.setLevel(logging.INFO)
 file_format = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 file_handler.setFormatter(file_format)
 
-# Adiciona os handlers ao logger
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
+# Buffer em memória para o arquivo: grava em lote a cada 30 segundos,
+# ao encher o buffer ou imediatamente em registros de nível ERROR ou maior
+LOG_FLUSH_INTERVAL = 30
+file_buffer = MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=file_handler)
+file_buffer.setLevel(file_handler.level)
+
+def flush_logs_periodicamente():
+    """Descarrega periodicamente o buffer de logs para o arquivo"""
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        file_buffer.flush()
+
+threading.Thread(target=flush_logs_periodicamente, name="LogFlushThread", daemon=True).start()
+atexit.register(file_buffer.flush)
+
+# As threads do bot apenas enfileiram os registros; console e arquivo
+# são escritos por uma única thread em segundo plano
+log_queue = queue.Queue(-1)
+logger.addHandler(QueueHandler(log_queue))
+log_listener = QueueListener(log_queue, console_handler, file_buffer, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)  # Executado antes do flush final (ordem inversa do registro)
+log_listener_lock = threading.Lock()
+
+def drenar_logs():
+    """
+    Grava no arquivo todos os registros pendentes: parar o listener processa
+    tudo o que está na fila; em seguida ele é reiniciado e o buffer descarregado
+    """
+    with log_listener_lock:
+        log_listener.stop()
+        log_listener.start()
+    file_buffer.flush()
 
 # Sistema de monitoramento de atividade
 class BotMonitor:
@@ -54,65 +101,91 @@ class BotMonitor:
             max_silence: Tempo máximo (segundos) sem atividade antes de ser considerado inativo
             restart_limit: Número máximo de reinicializações automáticas permitidas em 1 hora
         """
-        self.last_activity = time.time()
+        self.last_activity = time.monotonic()  # Relógio monotônico para cálculo de intervalos
+        self.last_activity_timestamp = time.time()  # Horário real, apenas para exibição
         self.max_silence = max_silence
         self.restart_count = 0
         self.restart_limit = restart_limit
-        self.restart_times = []
-        self.running = True
+        self.restart_times = collections.deque()
+        self.stop_event = threading.Event()  # Sinaliza o encerramento para as threads em espera
+        self.status_cache = (0.0, None)  # (instante monotônico, relatório) do último get_status_report
         self.error_queue = queue.Queue()
-        self.admin_chat_ids = []
+        self.admin_chat_ids = set()
+        
+        # Thread dedicada que registra os erros assim que são reportados
+        self.error_thread = threading.Thread(target=self.error_worker, name="ErrorThread", daemon=True)
+        self.error_thread.start()
         logger.info("Monitor de bot inicializado: monitoramento contínuo 24/7 ativado")
         
+    @property
+    def running(self):
+        """Indica se o bot ainda deve continuar rodando"""
+        return not self.stop_event.is_set()
+    
+    def stop(self):
+        """Sinaliza o encerramento, acordando imediatamente as threads em espera"""
+        self.stop_event.set()
+    
     def register_activity(self):
         """Registra atividade do bot"""
-        self.last_activity = time.time()
+        self.last_activity = time.monotonic()
+        self.last_activity_timestamp = time.time()
         
     def check_activity(self):
         """Verifica se o bot está ativo"""
-        time_since_last = time.time() - self.last_activity
+        time_since_last = time.monotonic() - self.last_activity
         return time_since_last <= self.max_silence
     
     def can_restart(self):
         """Verifica se o bot pode ser reiniciado (limita reinícios para evitar ciclos)"""
-        now = time.time()
-        # Remove reinícios mais antigos que 1 hora
-        self.restart_times = [t for t in self.restart_times if now - t < 3600]
+        now = time.monotonic()
+        # Remove reinícios mais antigos que 1 hora (a deque está em ordem cronológica)
+        while self.restart_times and now - self.restart_times[0] >= 3600:
+            self.restart_times.popleft()
         return len(self.restart_times) < self.restart_limit
     
     def register_restart(self):
         """Registra uma tentativa de reinício"""
-        self.restart_times.append(time.time())
+        self.restart_times.append(time.monotonic())
         self.restart_count += 1
         
     def report_error(self, error):
         """Adiciona um erro à fila para processamento"""
         self.error_queue.put(error)
         
-    def process_errors(self):
-        """Processa erros na fila"""
-        while not self.error_queue.empty():
-            error = self.error_queue.get()
+    def error_worker(self):
+        """Consome a fila de erros em segundo plano enquanto o bot estiver rodando"""
+        while self.running:
+            try:
+                error = self.error_queue.get(timeout=1)
+            except queue.Empty:
+                continue
             logger.error(f"Erro crítico detectado: {error}")
             
     def register_admin(self, chat_id):
         """Registra um chat de administrador para receber notificações"""
         if chat_id not in self.admin_chat_ids:
-            self.admin_chat_ids.append(chat_id)
+            self.admin_chat_ids.add(chat_id)
             logger.info(f"Administrador registrado: {chat_id}")
     
     def get_status_report(self):
-        """Gera um relatório de status do monitor"""
-        uptime = time.time() - self.last_activity
+        """Gera um relatório de status do monitor (reaproveitado por até 1 segundo)"""
+        gerado_em, relatorio = self.status_cache
+        if relatorio is not None and time.monotonic() - gerado_em < 1:
+            return relatorio
+        
+        uptime = time.monotonic() - self.last_activity
         hours, remainder = divmod(uptime, 3600)
         minutes, seconds = divmod(remainder, 60)
         
-        return {
+        relatorio = {
             "uptime": f"{int(hours)}h {int(minutes)}m {int(seconds)}s",
             "restart_count": self.restart_count,
             "active": self.check_activity(),
-            "last_activity": datetime.datetime.fromtimestamp(self.last_activity).strftime('%Y-%m-%d %H:%M:%S')
+            "last_activity": datetime.datetime.fromtimestamp(self.last_activity_timestamp).strftime('%Y-%m-%d %H:%M:%S')
         }
+        self.status_cache = (time.monotonic(), relatorio)
+        return relatorio
 
 # Inicializa o monitor global do bot
 bot_monitor = BotMonitor()
@@ -120,7 +193,7 @@ bot_monitor = BotMonitor()
 # Tratador de sinais para término gracioso
 def signal_handler(sig, frame):
     logger.info("Sinal de encerramento recebido. Encerrando o bot graciosamente...")
-    bot_monitor.running = False
+    bot_monitor.stop()
     sys.exit(0)
 
 # Registra manipuladores de sinais
@@ -130,18 +203,167 @@ signal.signal(signal.SIGTERM, signal_handler)
 # Load environment variables
 load_dotenv()
 
+# Gerador aleatório por thread: as threads do telebot, o envio de palpites e o
+# envio em fila sorteiam sem disputar o estado do random global
+rng_local = threading.local()
+
+def obter_rng():
+    """Retorna o random.Random da thread atual, criando-o no primeiro uso"""
+    rng = getattr(rng_local, 'rng', None)
+    if rng is None:
+        rng = rng_local.rng = random.Random()
+    return rng
+
+# Último horário formatado, como tupla (segundo, "HH:MM:SS") para ser trocado
+# de uma só vez entre threads
+hora_cache = (0, "")
+
+def now_hms():
+    """Retorna a hora atual como "HH:MM:SS", formatando no máximo uma vez por segundo"""
+    global hora_cache
+    agora = int(time.time())
+    segundo, texto = hora_cache
+    if agora != segundo:
+        texto = time.strftime('%H:%M:%S', time.localtime(agora))
+        hora_cache = (agora, texto)
+    return texto
+
+# Limitador de taxa adaptativo (token bucket) para os envios ao Telegram
+class TokenBucket:
+    def __init__(self, capacity, rate, min_rate=None, increment=None):
+        """
+        Inicializa um balde de tokens com taxa adaptativa
+
+        Args:
+            capacity: Número máximo de tokens acumulados (tamanho da rajada)
+            rate: Tokens repostos por segundo (também é a taxa máxima)
+            min_rate: Taxa mínima após reduções por limite de requisições
+            increment: Quanto a taxa sobe a cada envio bem-sucedido
+        """
+        self.capacity = capacity
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 8
+        self.increment = increment or rate / 10
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.condition = threading.Condition()
+
+    def _refill(self):
+        """Repõe os tokens proporcionalmente ao tempo decorrido"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def acquire(self):
+        """Bloqueia até haver um token disponível e o consome"""
+        with self.condition:
+            while True:
+                # A espera é calculada depois da reposição, com o saldo atual
+                self._refill()
+                if self.tokens >= 1:
+                    break
+                self.condition.wait(timeout=(1 - self.tokens) / self.rate)
+            self.tokens -= 1
+
+    def increase_rate(self):
+        """Aumenta a taxa gradualmente após um envio bem-sucedido"""
+        with self.condition:
+            self.rate = min(self.rate + self.increment, self.max_rate)
+
+    def decrease_rate(self):
+        """Reduz a taxa pela metade após um limite de requisições (429)"""
+        with self.condition:
+            self._refill()
+            self.rate = max(self.rate / 2, self.min_rate)
+
+# Limites do Telegram: 30 mensagens/s no total e 1 mensagem/s por chat
+global_bucket = TokenBucket(capacity=30, rate=30)
+# Baldes por chat em ordem de último uso; os ociosos há mais de BUCKET_CHAT_OCIOSO
+# segundos já estão cheios e são descartados sem alterar o limite do chat
+BUCKET_CHAT_OCIOSO = 60
+per_chat_buckets = collections.OrderedDict()
+per_chat_lock = threading.Lock()
+
+def obter_bucket_chat(chat_id):
+    """Retorna (criando se necessário) o balde de tokens de um chat"""
+    with per_chat_lock:
+        bucket = per_chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = per_chat_buckets[chat_id] = TokenBucket(capacity=1, rate=1)
+        else:
+            per_chat_buckets.move_to_end(chat_id)
+        
+        # Remove do início (menos recentes) os baldes ociosos
+        limite = time.monotonic() - BUCKET_CHAT_OCIOSO
+        while per_chat_buckets:
+            mais_antigo = next(iter(per_chat_buckets.values()))
+            if mais_antigo is bucket or mais_antigo.last_refill > limite:
+                break
+            per_chat_buckets.popitem(last=False)
+        return bucket
+
+def aguardar_limites_envio(chat_id):
+    """Bloqueia até haver tokens nos limites do chat informado e global"""
+    # O token do chat vem primeiro: esperar por ele não retém um token global
+    obter_bucket_chat(chat_id).acquire()
+    global_bucket.acquire()
+
+# Cliente do Telegram que passa todo envio, edição e remoção de mensagens
+# pelos limitadores de taxa antes de chamar a API
+class RateLimitedTeleBot(telebot.TeleBot):
+    def send_message(self, chat_id, *args, **kwargs):
+        aguardar_limites_envio(chat_id)
+        return super().send_message(chat_id, *args, **kwargs)
+    
+    def edit_message_text(self, *args, **kwargs):
+        # chat_id é o segundo argumento posicional ou vem por nome
+        chat_id = kwargs.get('chat_id', args[1] if len(args) > 1 else None)
+        if chat_id is not None:
+            aguardar_limites_envio(chat_id)
+        return super().edit_message_text(*args, **kwargs)
+    
+    def delete_message(self, chat_id, *args, **kwargs):
+        aguardar_limites_envio(chat_id)
+        return super().delete_message(chat_id, *args, **kwargs)
+    
+    def _exec_task(self, task, *args, **kwargs):
+        # Os handlers de cada chat vão para a fila própria desse chat no
+        # animation_loop: a thread de polling volta ao getUpdates imediatamente.
+        # A biblioteca chama este método com formatos diferentes (lista de
+        # mensagens para os listeners, uma mensagem para handlers e next-step);
+        # o que não tiver um chat identificável segue pelo worker_pool padrão
+        chave = chave_fila_chat(args)
+        if chave is None:
+            return super()._exec_task(task, *args, **kwargs)
+        animation_loop.call_soon_threadsafe(despachar_para_chat, chave, task, args, kwargs)
+
 # Token do seu bot - use environment variable or default
 BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "7768159520:AAHVAyQdZo-4tDS8_8rC6HtBZAFi1WjEX9g")
+# Threads que executam os handlers: as filas por chat rodam no executor do
+# animation_loop e o pool próprio da biblioteca atende o restante
+NUM_THREADS_HANDLERS = max(4, (os.cpu_count() or 1) * 2)
+
 # Configuração para maior resiliência nas conexões com o Telegram
-bot = telebot.TeleBot(BOT_TOKEN, parse_mode=None, threaded=True)
+bot = RateLimitedTeleBot(BOT_TOKEN, parse_mode=None, threaded=True, num_threads=NUM_THREADS_HANDLERS)
 
 # Configurando timeouts para melhorar a estabilidade em conexões lentas
 try:
-    import telebot.apihelper
     telebot.apihelper.READ_TIMEOUT = 30
-    telebot.apihelper.CONNECT_TIMEOUT = 20
+    telebot.apihelper.CONNECT_TIMEOUT = 5
     telebot.apihelper.RETRY_ON_ERROR = True
-    telebot.apihelper.SESSION_TIME_TO_LIVE = 5*60  # 5 minutos
+    # Uma única sessão HTTP compartilhada por todas as threads (palpites,
+    # monitor, handlers), mantendo as conexões TLS vivas no pool
+    # (um único host, api.telegram.org: poucos pools, muitas conexões por pool)
+    TELEGRAM_SESSION = requests.Session()
+    TELEGRAM_SESSION.mount("https://", requests.adapters.HTTPAdapter(
+        pool_connections=4, pool_maxsize=64, max_retries=0))
+    telebot.apihelper.session = TELEGRAM_SESSION
+    # Retentativas no laço simples da biblioteca: o outro motor monta um
+    # HTTPAdapter novo na sessão, descartando o pool configurado acima
+    telebot.apihelper.RETRY_ENGINE = 1
+    # Sem TTL: com sessão compartilhada a renovação periódica não tem efeito
+    telebot.apihelper.SESSION_TIME_TO_LIVE = None
     logger.info("Configurações de timeout do Telegram aplicadas com sucesso")
 except Exception as e:
     logger.warning(f"Não foi possível configurar parâmetros do Telegram: {e}")
@@ -170,64 +392,162 @@ except ValueError:
 CANAL_ID = -1002510265632
 CANAL_ID_ALT = 1002510265632
 
-# Função auxiliar resiliente para envio de mensagens no Telegram
-def enviar_mensagem_resiliente(chat_ids, texto, markup=None, parse_mode='Markdown', retry_count=3, timeout=2):
+# IDs do canal a tentar, em ordem de preferência
+CANAL_IDS = (CANAL_ID, CANAL_ID_ALT, '@bacboprediction1')
+
+# ID do canal que aceitou o último envio (None até o primeiro envio bem-sucedido).
+# Escrito por várias threads (palpites, fila de envios, /test), sempre sob canal_lock
+canal_funcional = None
+canal_lock = threading.Lock()
+
+def definir_canal_funcional(canal_id):
+    """Fixa o canal que funcionou para os próximos envios (None volta a tentar todos)"""
+    global canal_funcional
+    with canal_lock:
+        canal_funcional = canal_id
+
+def canais_para_envio():
+    """Retorna apenas o canal que já funcionou ou, se ainda não houver, todos os candidatos"""
+    canal = canal_funcional
+    return (canal,) if canal is not None else CANAL_IDS
+
+# Expressão pré-compilada para extrair o "retry after N" do texto de erro da API
+RETRY_AFTER_RE = re.compile(r'retry after (\d+)', re.IGNORECASE)
+
+def obter_retry_after(erro):
     """
-    Envia uma mensagem para um ou mais chats com mecanismo de retry e backoff
+    Extrai o tempo de espera de um erro 429 do Telegram a partir dos campos estruturados
     
     Args:
-        chat_ids: ID do chat único ou lista de IDs para tentar
-        texto: Texto da mensagem
-        markup: Markup do teclado inline (opcional) 
-        parse_mode: Formato da mensagem
-        retry_count: Número de tentativas por chat
-        timeout: Tempo inicial entre tentativas
+        erro: Exceção lançada pela chamada à API
     
     Returns:
-        tuple: (Mensagem enviada, Success status)
+        int: Segundos a aguardar, ou None se não for um 429 ou o tempo não for informado
     """
-    if not isinstance(chat_ids, list):
-        chat_ids = [chat_ids]
+    if not isinstance(erro, ApiTelegramException) or erro.error_code != 429:
+        return None
+    
+    parametros = (erro.result_json or {}).get('parameters') or {}
+    retry_after = parametros.get('retry_after')
+    
+    # Fallback para o cabeçalho HTTP Retry-After, se presente
+    if retry_after is None and erro.result is not None:
+        retry_after = erro.result.headers.get('Retry-After')
+    
+    # Último recurso: a descrição textual do erro
+    if retry_after is None:
+        match = RETRY_AFTER_RE.search(erro.description or '')
+        retry_after = match.group(1) if match else None
+    
+    try:
+        return int(retry_after) if retry_after is not None else None
+    except (TypeError, ValueError):
+        return None
+
+# Tempo máximo (segundos) gasto em retentativas para um mesmo chat
+TEMPO_MAXIMO_RETRY = 60
+
+# Fila única de envios: uma thread dedicada coordena todos os envios ao Telegram
+send_queue = queue.Queue()
+
+# Evento liberado normalmente; é limpo durante a pausa imposta por um retry_after
+envios_liberados = threading.Event()
+envios_liberados.set()
+
+# Fim (monotônico) da pausa em andamento e o timer que a encerra. Pausas
+# sobrepostas só estendem o prazo: uma mais curta nunca libera antes da hora
+pausa_lock = threading.Lock()
+pausa_prazo = 0.0
+pausa_timer = None
+
+def pausar_envios(wait_time):
+    """Suspende todos os envios da fila por wait_time segundos"""
+    global pausa_prazo, pausa_timer
+    with pausa_lock:
+        prazo = time.monotonic() + wait_time
+        if prazo <= pausa_prazo:
+            return  # A pausa atual já cobre este intervalo
+        pausa_prazo = prazo
+        envios_liberados.clear()
+        if pausa_timer is not None:
+            pausa_timer.cancel()
+        pausa_timer = threading.Timer(wait_time, liberar_envios)
+        pausa_timer.daemon = True
+        pausa_timer.start()
+
+def liberar_envios():
+    """Encerra a pausa, a menos que ela tenha sido estendida nesse meio tempo"""
+    with pausa_lock:
+        if time.monotonic() >= pausa_prazo:
+            envios_liberados.set()
+
+def processar_envio(chat_ids, texto, markup, parse_mode, retry_count, timeout, disable_notification=False):
+    """
+    Executa o envio de um item da fila com mecanismo de retry e backoff
     
+    Returns:
+        tuple: (Mensagem enviada, Success status)
+    """
     sent_msg = None
     success = False
     
+    # Se um dos IDs candidatos já funcionou antes, ele é tentado primeiro
+    # e os demais ficam apenas como reserva
+    canal_fixado = canal_funcional
+    if canal_fixado is not None and len(chat_ids) > 1 and canal_fixado in chat_ids:
+        chat_ids = (canal_fixado,) + tuple(c for c in chat_ids if c != canal_fixado)
+    
     for chat_id in chat_ids:
-        if success:
-            break
-        
         # Backoff exponencial para retry
         backoff = timeout
-        
+        chat_bucket = obter_bucket_chat(chat_id)
+        prazo_retry = time.monotonic() + TEMPO_MAXIMO_RETRY
+
         for attempt in range(retry_count):
+            # Limita as retentativas também pelo tempo total decorrido
+            if attempt > 0 and time.monotonic() >= prazo_retry:
+                logger.warning(f"Tempo máximo de retentativas esgotado para {chat_id}")
+                break
+            
             try:
-                logger.info(f"Tentando enviar mensagem para {chat_id} (tentativa {attempt+1}/{retry_count})")
+                # Respeita uma pausa global em andamento (os limites de taxa
+                # são aplicados pelo próprio bot.send_message)
+                envios_liberados.wait()
+
+                logger.debug(f"Tentando enviar mensagem para {chat_id} (tentativa {attempt+1}/{retry_count})")
                 sent_msg = bot.send_message(
-                    chat_id, 
-                    texto, 
-                    reply_markup=markup, 
+                    chat_id,
+                    texto,
+                    reply_markup=markup,
                     parse_mode=parse_mode,
-                    disable_web_page_preview=True
+                    disable_web_page_preview=True,
+                    disable_notification=disable_notification
                 )
                 logger.info(f"Mensagem enviada com sucesso para {chat_id}")
+                global_bucket.increase_rate()
+                chat_bucket.increase_rate()
                 success = True
                 break
-            
+
             except Exception as e:
                 error_msg = str(e)
                 logger.error(f"Erro ao enviar para {chat_id} (tentativa {attempt+1}): {error_msg}")
-                
+
                 # Verificação específica para rate limiting
-                if "Too Many Requests: retry after" in error_msg:
-                    try:
-                        # Extrai o tempo a aguardar direto da resposta da API
-                        wait_time = int(error_msg.split("retry after ")[1])
-                        logger.warning(f"Limite de requisições atingido, aguardando {wait_time}s...")
-                        time.sleep(wait_time + 1)  # +1 para margem de segurança
-                    except (ValueError, IndexError):
+                if isinstance(e, ApiTelegramException) and e.error_code == 429:
+                    # Reduz a taxa dos limitadores para evitar novos 429
+                    global_bucket.decrease_rate()
+                    chat_bucket.decrease_rate()
+                    
+                    # Extrai o tempo a aguardar direto da resposta da API
+                    wait_time = obter_retry_after(e)
+                    if wait_time is not None:
+                        logger.warning(f"Limite de requisições atingido, pausando a fila por {wait_time}s...")
+                        pausar_envios(wait_time + 1)  # +1 para margem de segurança
+                    else:
                         # Se não conseguir extrair o tempo, usa backoff exponencial
-                        logger.warning(f"Usando backoff exponencial: {backoff}s")
-                        time.sleep(backoff)
+                        logger.warning(f"Usando backoff exponencial: até {backoff}s")
+                        time.sleep(obter_rng().uniform(backoff * 0.5, backoff))  # Jitter para dessincronizar retentativas
                         backoff = min(backoff * 2, 30)  # Limita o backoff a 30s
                 
                 # Se o chat simplesmente não existir, não tem porque continuar tentando
@@ -237,14 +557,83 @@ def enviar_mensagem_resiliente(chat_ids, texto, markup=None, parse_mode='Markdow
                 
                 # Para outros erros, espera um tempo antes de tentar novamente
                 else:
-                    time.sleep(backoff)
+                    time.sleep(obter_rng().uniform(backoff * 0.5, backoff))  # Jitter para dessincronizar retentativas
                     backoff = min(backoff * 1.5, 15)  # 1.5x com limite de 15s
+        
+        if success:
+            break
+    
+    # Atualiza o canal fixado: o vencedor passa a ser o primeiro a tentar e,
+    # se o canal fixado falhou junto com os demais, volta a tentar todos
+    if success:
+        if chat_id in CANAL_IDS and chat_id != canal_fixado:
+            definir_canal_funcional(chat_id)
+    elif canal_fixado is not None and canal_fixado in chat_ids:
+        definir_canal_funcional(None)
     
     # Registra atividade independente do resultado
     bot_monitor.register_activity()
     
     return sent_msg, success
 
+def sender_worker():
+    """Thread dedicada que consome a fila de envios em ordem"""
+    while True:
+        chat_ids, texto, markup, parse_mode, retry_count, timeout, disable_notification, future = send_queue.get()
+        try:
+            future.set_result(processar_envio(chat_ids, texto, markup, parse_mode, retry_count, timeout, disable_notification))
+        except Exception as e:
+            logger.error(f"Erro inesperado na thread de envios: {e}")
+            future.set_exception(e)
+        finally:
+            send_queue.task_done()
+
+sender_thread = threading.Thread(target=sender_worker, name="SenderThread", daemon=True)
+sender_thread.start()
+
+def enfileirar_mensagem(chat_ids, texto, markup=None, parse_mode='Markdown', retry_count=3, timeout=2, disable_notification=False):
+    """
+    Coloca uma mensagem na fila de envios sem bloquear o chamador
+    
+    Args:
+        chat_ids: ID do chat único ou lista/tupla de IDs para tentar
+        texto: Texto da mensagem
+        markup: Markup do teclado inline (opcional) 
+        parse_mode: Formato da mensagem
+        retry_count: Número de tentativas por chat
+        timeout: Tempo inicial entre tentativas
+        disable_notification: Envia sem som/alerta
+    
+    Returns:
+        Future: Resolvido com (Mensagem enviada, Success status)
+    """
+    if not isinstance(chat_ids, (list, tuple)):
+        chat_ids = [chat_ids]
+    
+    future = concurrent.futures.Future()
+    send_queue.put((chat_ids, texto, markup, parse_mode, retry_count, timeout, disable_notification, future))
+    return future
+
+# Função auxiliar resiliente para envio de mensagens no Telegram
+def enviar_mensagem_resiliente(chat_ids, texto, markup=None, parse_mode='Markdown', retry_count=3, timeout=2, disable_notification=False):
+    """
+    Envia uma mensagem para um ou mais chats através da fila de envios,
+    aguardando o resultado
+    
+    Args:
+        chat_ids: ID do chat único ou lista/tupla de IDs para tentar
+        texto: Texto da mensagem
+        markup: Markup do teclado inline (opcional) 
+        parse_mode: Formato da mensagem
+        retry_count: Número de tentativas por chat
+        timeout: Tempo inicial entre tentativas
+        disable_notification: Envia sem som/alerta
+    
+    Returns:
+        tuple: (Mensagem enviada, Success status)
+    """
+    return enfileirar_mensagem(chat_ids, texto, markup, parse_mode, retry_count, timeout, disable_notification).result()
+
 CANAL_TITULO = "KJ_BACBOT"  # Título do canal conforme informado
 
 logger.info(f"Usando ID do canal principal: {CANAL_ID}")
@@ -267,27 +656,68 @@ meta_acertos_consecutivos = 30  # Meta de acertos consecutivos
 # ID do primeiro usuário que iniciou o bot (para enviar palpites privados se o canal falhar)
 PRIMEIRO_USUARIO_ID = None
 
+# Palpites como constantes internadas: todas as referências apontam para o mesmo
+# objeto, então as estratégias comparam palpites por identidade (is)
+P_LA_AZ = sys.intern('🟠+🔵 Laranja e Azul')
+P_LA_VM = sys.intern('🟠+🔴 Laranja e Vermelho')
+P_AZ_VM = sys.intern('🔵+🔴 Azul e Vermelho')
+P_LA = sys.intern('🟠 Laranja')
+P_AZ = sys.intern('🔵 Azul')
+P_VM = sys.intern('🔴 Vermelho')
+
+# Combinações com laranja usadas nos palpites de emergência
+COMBINACOES = (P_LA_AZ, P_LA_VM)
+
 # Cores possíveis no Bac Bo
-cores = ['🔵 Azul', '🟠 Laranja', '🔴 Vermelho']
-cores_combinadas = ['🔵+🟠 Azul e Laranja', '🔵+🔴 Azul e Vermelho', '🟠+🔴 Laranja e Vermelho']
+cores = [P_AZ, P_LA, P_VM]
+cores_combinadas = ['🔵+🟠 Azul e Laranja', P_AZ_VM, P_LA_VM]
 
 # Mapa de resultados para cálculo de assertividade
 # Se apostar em combinação e acertar uma das cores, considera acerto
 # Ajustado para maior taxa de acerto nas combinações com Laranja que são mais eficazes
 resultado_mapa = {
-    '🔵': {'🔵 Azul': True, '🟠 Laranja': False, '🔴 Vermelho': False, 
-           '🟠+🔵 Laranja e Azul': True, '🟠+🔴 Laranja e Vermelho': False,
-           '🔵+🔴 Azul e Vermelho': True},
+    '🔵': {P_AZ: True, P_LA: False, P_VM: False,
+           P_LA_AZ: True, P_LA_VM: False,
+           P_AZ_VM: True},
            
-    '🔴': {'🔵 Azul': False, '🟠 Laranja': False, '🔴 Vermelho': True, 
-           '🟠+🔵 Laranja e Azul': False, '🟠+🔴 Laranja e Vermelho': True,
-           '🔵+🔴 Azul e Vermelho': True},
+    '🔴': {P_AZ: False, P_LA: False, P_VM: True,
+           P_LA_AZ: False, P_LA_VM: True,
+           P_AZ_VM: True},
            
-    '🟠': {'🔵 Azul': False, '🟠 Laranja': True, '🔴 Vermelho': False, 
-           '🟠+🔵 Laranja e Azul': True, '🟠+🔴 Laranja e Vermelho': True,
-           '🔵+🔴 Azul e Vermelho': False},
+    '🟠': {P_AZ: False, P_LA: True, P_VM: False,
+           P_LA_AZ: True, P_LA_VM: True,
+           P_AZ_VM: False},
 }
 
+# Cores como inteiros: comparações e tabelas usam o enum, emojis apenas para exibição
+class Cor(IntEnum):
+    AZUL = 0
+    VERMELHO = 1
+    LARANJA = 2
+
+COR_EMOJI = {Cor.AZUL: sys.intern('🔵'), Cor.VERMELHO: sys.intern('🔴'), Cor.LARANJA: sys.intern('🟠')}
+COR_NOME = {Cor.AZUL: P_AZ, Cor.VERMELHO: P_VM, Cor.LARANJA: P_LA}
+
+# Versão compacta do resultado_mapa: cores e apostas viram índices inteiros e
+# o acerto é lido de uma tabela de bytes na posição resultado * N_APOSTAS + aposta
+COLOR_IDX = {emoji: cor for cor, emoji in COR_EMOJI.items()}
+APOSTAS = tuple(resultado_mapa['🔵'])
+APOSTA_IDX = {aposta: i for i, aposta in enumerate(APOSTAS)}
+N_APOSTAS = len(APOSTAS)
+WIN_TABLE = bytes(
+    resultado_mapa[cor][aposta]
+    for cor in sorted(COLOR_IDX, key=COLOR_IDX.get)
+    for aposta in APOSTAS
+)
+
+def palpite_acertou(resultado, palpite):
+    """Verifica na tabela pré-computada se o palpite acerta o resultado"""
+    r = COLOR_IDX.get(resultado)
+    b = APOSTA_IDX.get(palpite)
+    if r is None or b is None:
+        return False
+    return WIN_TABLE[r * N_APOSTAS + b] == 1
+
 # Histórico de resultados da Elephant Bet
 # Simulação inicial - será substituído pela integração real com API
 resultados_anteriores = {
@@ -297,23 +727,34 @@ resultados_anteriores = {
     'ultima_atualizacao': time.time()
 }
 
-# Importações para a integração real com a Elephant Bet
-import requests
-from bs4 import BeautifulSoup
-import json
-import random
-import time
-import datetime
-
-# Cache de sessão para reutilizar cookies e headers
-session = requests.Session()
-session.headers.update({
+# Cabeçalhos usados em todas as requisições à Elephant Bet
+ELEPHANT_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
     'Referer': 'https://elephant.bet/',
     'Origin': 'https://elephant.bet'
-})
+}
+
+# Cache de sessão para reutilizar cookies, headers e conexões
+# Usa httpx com HTTP/2 (uma conexão multiplexada, sem novos handshakes TLS) quando disponível
+try:
+    import httpx
+    session = httpx.Client(
+        http2=True,
+        headers=ELEPHANT_HEADERS,
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=4)
+    )
+    HAS_HTTPX = True
+except ImportError:
+    # httpx/h2 não instalados - mantém requests (HTTP/1.1) com pool de conexões reutilizáveis
+    session = requests.Session()
+    session.headers.update(ELEPHANT_HEADERS)
+    session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    HAS_HTTPX = False
+
+logger.info(f"Cliente HTTP da Elephant Bet: {'httpx (HTTP/2)' if HAS_HTTPX else 'requests (HTTP/1.1)'}")
 
 # URLs e endpoints da Elephant Bet
 ELEPHANT_BET_URL = "https://elephant.bet"
@@ -327,6 +768,67 @@ COLOR_MAPPING = {
     "orange": "🟠"    # Laranja/Empate
 }
 
+# Parser HTML e seletores do scraping - importados apenas no primeiro uso,
+# já que o scraping é só o segundo método de obtenção dos resultados
+HAS_SELECTOLAX = None  # Definido em carregar_parser_scraping
+HTMLParser = None
+BeautifulSoup = None
+RESULTS_CONTAINER_SEL = None
+RESULT_ITEM_SEL = None
+
+def carregar_parser_scraping():
+    """
+    Importa o parser HTML do scraping: selectolax (binding Cython do Lexbor/Modest)
+    se instalado, senão BeautifulSoup com seletores CSS pré-compilados
+    """
+    global HAS_SELECTOLAX, HTMLParser, BeautifulSoup, RESULTS_CONTAINER_SEL, RESULT_ITEM_SEL
+    if HAS_SELECTOLAX is not None:
+        return
+    
+    try:
+        from selectolax.parser import HTMLParser
+        HAS_SELECTOLAX = True
+    except ImportError:
+        from bs4 import BeautifulSoup
+        import soupsieve
+        RESULTS_CONTAINER_SEL = soupsieve.compile('.game-results-container')
+        RESULT_ITEM_SEL = soupsieve.compile('.result-item')
+        HAS_SELECTOLAX = False
+
+def extrair_classes_resultados(html):
+    """
+    Extrai as classes CSS dos últimos itens de resultado da página do jogo.
+    Usa o selectolax quando disponível e o BeautifulSoup como alternativa.
+    
+    Args:
+        html: Conteúdo HTML da página do jogo
+    
+    Returns:
+        list: Lista de classes de cada item (até 10), ou None se o container não existir
+    """
+    carregar_parser_scraping()
+    
+    if HAS_SELECTOLAX:
+        tree = HTMLParser(html)
+        results_container = tree.css_first('.game-results-container')
+        if results_container is None:
+            return None
+        return [(item.attributes.get('class') or '').split() for item in results_container.css('.result-item')[:10]]
+    
+    soup = BeautifulSoup(html, 'html.parser')
+    results_container = RESULTS_CONTAINER_SEL.select_one(soup)
+    if results_container is None:
+        return None
+    return [item.get('class', []) for item in RESULT_ITEM_SEL.select(results_container, limit=10)]
+
+# Garante que apenas uma thread consulte a Elephant Bet quando o cache expira
+elephant_refresh_lock = threading.Lock()
+
+# Tempo (s) durante o qual o último resultado da Elephant Bet é reaproveitado,
+# inclusive após falhas, para não repetir a consulta a cada palpite
+ELEPHANT_CACHE_TTL = 10
+elephant_cache_expira = 0.0  # Instante (time.monotonic) em que o cache expira
+
 # Função para integração real com a Elephant Bet
 def atualizar_resultados_elephant():
     """
@@ -337,142 +839,147 @@ def atualizar_resultados_elephant():
     Returns:
         dict: Dados atualizados da Elephant Bet
     """
-    global resultados_anteriores
+    global resultados_anteriores, elephant_cache_expira
     
-    # Verifica se passou tempo suficiente desde a última atualização (10 segundos)
-    tempo_atual = time.time()
-    if tempo_atual - resultados_anteriores.get('ultima_atualizacao', 0) < 10:
-        return resultados_anteriores  # Usa cache para evitar muitas requisições
+    # Usa o cache enquanto o TTL não expirar para evitar muitas requisições
+    if time.monotonic() < elephant_cache_expira:
+        return resultados_anteriores
     
-    try:
-        logger.info("Obtendo resultados da Elephant Bet (dados reais)")
+    # Apenas uma thread atualiza por vez; as demais aguardam e reutilizam o resultado
+    with elephant_refresh_lock:
+        # Confere novamente: outra thread pode ter atualizado enquanto esperávamos
+        if time.monotonic() < elephant_cache_expira:
+            return resultados_anteriores
         
-        # Tenta obter dados da API de resultados do Bac Bo na Elephant Bet
+        tempo_atual = time.time()
         try:
-            # Primeiro método: Tentativa via API JSON
-            response = session.get(BACBO_RESULTS_API, timeout=5)
-            
-            if response.status_code == 200:
-                logger.info("Conseguiu obter dados via API de resultados")
-                data = response.json()
-                
-                # Extrai os últimos resultados das rodadas
-                recent_results = []
-                for round_data in data.get('rounds', [])[:10]:
-                    # Mapeia o resultado para o emoji correspondente
-                    result_color = round_data.get('result', 'orange')  # Default para laranja/empate
-                    emoji_result = COLOR_MAPPING.get(result_color, "🟠")
-                    recent_results.append(emoji_result)
-                
-                # Se temos pelo menos um resultado, o mais recente é o atual
-                if recent_results:
-                    novo_resultado = recent_results[0]
-                    logger.info(f"Resultado atual via API: {novo_resultado}")
-                else:
-                    raise ValueError("Não foi possível extrair resultados recentes da API")
-            else:
-                raise ValueError(f"API retornou código de status: {response.status_code}")
-                
-        except Exception as api_error:
-            logger.warning(f"Falha ao obter dados via API: {api_error}")
+            logger.info("Obtendo resultados da Elephant Bet (dados reais)")
             
-            # Segundo método: Web scraping da página do jogo
+            # Tenta obter dados da API de resultados do Bac Bo na Elephant Bet
             try:
-                logger.info("Tentando obter via web scraping da página do jogo")
-                response = session.get(BACBO_GAME_URL, timeout=5)
+                # Primeiro método: Tentativa via API JSON
+                response = session.get(BACBO_RESULTS_API, timeout=5)
                 
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                    logger.info("Conseguiu obter dados via API de resultados")
+                    data = response.json()
+                    
+                    # Extrai os últimos resultados das rodadas
+                    recent_results = []
+                    for round_data in data.get('rounds', [])[:10]:
+                        # Mapeia o resultado para o emoji correspondente
+                        result_color = round_data.get('result', 'orange')  # Default para laranja/empate
+                        emoji_result = COLOR_MAPPING.get(result_color, "🟠")
+                        recent_results.append(emoji_result)
+                    
+                    # Se temos pelo menos um resultado, o mais recente é o atual
+                    if recent_results:
+                        novo_resultado = recent_results[0]
+                        fonte = 'API Elephant Bet'
+                        logger.info("Resultado atual via API: %s", novo_resultado)
+                    else:
+                        raise ValueError("Não foi possível extrair resultados recentes da API")
+                else:
+                    raise ValueError(f"API retornou código de status: {response.status_code}")
                     
-                    # Tenta encontrar o elemento que contém os últimos resultados
-                    results_container = soup.select_one('.game-results-container')
+            except Exception as api_error:
+                logger.warning("Falha ao obter dados via API: %s", api_error)
+                
+                # Segundo método: Web scraping da página do jogo
+                try:
+                    logger.info("Tentando obter via web scraping da página do jogo")
+                    response = session.get(BACBO_GAME_URL, timeout=5)
                     
-                    if results_container:
-                        # Extrai os resultados recentes
-                        result_items = results_container.select('.result-item')
-                        recent_results = []
+                    if response.status_code == 200:
+                        # Tenta encontrar o elemento que contém os últimos resultados
+                        classes_resultados = extrair_classes_resultados(response.text)
                         
-                        for item in result_items[:10]:
-                            # Determina a cor com base nas classes do elemento
-                            if 'result-red' in item.get('class', []):
-                                emoji_result = "🔴"
-                            elif 'result-blue' in item.get('class', []):
-                                emoji_result = "🔵"
-                            else:
-                                emoji_result = "🟠"  # Laranja/Empate
+                        if classes_resultados is not None:
+                            # Extrai os resultados recentes
+                            recent_results = []
                             
-                            recent_results.append(emoji_result)
-                        
-                        # Se temos pelo menos um resultado, o mais recente é o atual
-                        if recent_results:
-                            novo_resultado = recent_results[0]
-                            logger.info(f"Resultado atual via scraping: {novo_resultado}")
+                            for classes in classes_resultados:
+                                # Determina a cor com base nas classes do elemento
+                                if 'result-red' in classes:
+                                    emoji_result = "🔴"
+                                elif 'result-blue' in classes:
+                                    emoji_result = "🔵"
+                                else:
+                                    emoji_result = "🟠"  # Laranja/Empate
+                                
+                                recent_results.append(emoji_result)
+                            
+                            # Se temos pelo menos um resultado, o mais recente é o atual
+                            if recent_results:
+                                novo_resultado = recent_results[0]
+                                fonte = 'Web Scraping'
+                                logger.info("Resultado atual via scraping: %s", novo_resultado)
+                            else:
+                                raise ValueError("Não foi possível extrair resultados recentes via scraping")
                         else:
-                            raise ValueError("Não foi possível extrair resultados recentes via scraping")
+                            raise ValueError("Container de resultados não encontrado na página")
                     else:
-                        raise ValueError("Container de resultados não encontrado na página")
-                else:
-                    raise ValueError(f"Página retornou código de status: {response.status_code}")
+                        raise ValueError(f"Página retornou código de status: {response.status_code}")
+                        
+                except Exception as scraping_error:
+                    logger.error("Falha ao fazer scraping da página: %s", scraping_error)
                     
-            except Exception as scraping_error:
-                logger.error(f"Falha ao fazer scraping da página: {scraping_error}")
-                
-                # Terceiro método: Fallback para simulação (apenas se as duas tentativas anteriores falharem)
-                logger.warning("Usando fallback para simulação de resultados")
-                cores = ['🔴', '🔵', '🟠']
-                
-                # Usa uma tendência mais realista baseada nos padrões típicos do Bac Bo
-                # Hora atual servindo como seed para o random para maior consistência
-                random.seed(int(time.time()) // 60)  # Muda a cada minuto
-                
-                # Distribuição mais realista: Vermelho (35%), Azul (35%), Laranja (30%)
-                weights = [0.35, 0.35, 0.30]
-                novo_resultado = random.choices(cores, weights=weights, k=1)[0]
-                
-                # Gera ultimos_10 consistentes com a mesma seed
-                recent_results = []
-                for i in range(10):
-                    recent_results.append(random.choices(cores, weights=weights, k=1)[0])
+                    # Terceiro método: Fallback para simulação (apenas se as duas tentativas anteriores falharem)
+                    logger.warning("Usando fallback para simulação de resultados")
+                    fonte = 'Simulação (Fallback)'
+                    cores = ['🔴', '🔵', '🟠']
+                    
+                    # Usa uma tendência mais realista baseada nos padrões típicos do Bac Bo
+                    # Hora atual servindo como seed para maior consistência, em um gerador
+                    # local para não alterar o estado do random global das outras threads
+                    rng = random.Random(int(time.time()) // 60)  # Muda a cada minuto
+                    
+                    # Distribuição mais realista: Vermelho (35%), Azul (35%), Laranja (30%)
+                    # Sorteia o resultado atual e os ultimos_10 de uma só vez
+                    weights = [0.35, 0.35, 0.30]
+                    sorteio = rng.choices(cores, weights=weights, k=11)
+                    novo_resultado = sorteio[0]
+                    recent_results = sorteio[1:]
+                    
+                    logger.info("Resultado via simulação (fallback): %s", novo_resultado)
+            
+            # Atualiza a lista de últimos resultados (mantém os 10 mais recentes)
+            ultimos = recent_results
+            if len(ultimos) > 10:
+                ultimos = ultimos[:10]  # Garante que temos apenas os 10 mais recentes
                 
-                logger.info(f"Resultado via simulação (fallback): {novo_resultado}")
-        
-        # Atualiza a lista de últimos resultados (mantém os 10 mais recentes)
-        ultimos = recent_results
-        if len(ultimos) > 10:
-            ultimos = ultimos[:10]  # Garante que temos apenas os 10 mais recentes
+            # Calcula novas frequências
+            contador = collections.Counter(ultimos)
             
-        # Calcula novas frequências
-        contador = {'🔴': 0, '🔵': 0, '🟠': 0}
-        for resultado in ultimos:
-            contador[resultado] = contador.get(resultado, 0) + 1
-        
-        total = len(ultimos)
-        frequencia = {cor: contador[cor] / total for cor in contador}
-        
-        # Determina a tendência (cor mais frequente)
-        tendencia = max(contador.keys(), key=lambda k: contador[k])
-        
-        # Adiciona timestamp da última rodada
-        timestamp_rodada = datetime.datetime.now().strftime('%H:%M:%S')
-        
-        # Atualiza o dicionário de resultados
-        resultados_anteriores = {
-            'ultimos_10': ultimos,
-            'frequencia': frequencia,
-            'tendencia': tendencia,
-            'ultima_atualizacao': tempo_atual,
-            'resultado_atual': novo_resultado,  # Guarda o resultado atual da Elephant Bet
-            'timestamp_rodada': timestamp_rodada,  # Hora da última rodada
-            'fonte': 'API Elephant Bet' if 'data' in locals() else 'Web Scraping' if 'soup' in locals() else 'Simulação (Fallback)'
-        }
+            total = len(ultimos)
+            frequencia = {cor: contador[cor] / total for cor in ('🔴', '🔵', '🟠')}
+            
+            # Determina a tendência (cor mais frequente)
+            tendencia = contador.most_common(1)[0][0]
+            
+            # Adiciona timestamp da última rodada
+            timestamp_rodada = now_hms()
+            
+            # Atualiza o dicionário de resultados
+            resultados_anteriores = {
+                'ultimos_10': ultimos,
+                'frequencia': frequencia,
+                'tendencia': tendencia,
+                'ultima_atualizacao': tempo_atual,
+                'resultado_atual': novo_resultado,  # Guarda o resultado atual da Elephant Bet
+                'timestamp_rodada': timestamp_rodada,  # Hora da última rodada
+                'fonte': fonte
+            }
+            
+            # Log detalhado do resultado obtido
+            logger.info("Resultado atual da Elephant Bet: %s (Fonte: %s)", novo_resultado, resultados_anteriores['fonte'])
+            
+        except Exception as e:
+            logger.error("Erro ao obter resultados da Elephant Bet: %s", e)
+            # Em caso de erro, mantém os resultados anteriores
         
-        # Log detalhado do resultado obtido
-        logger.info(f"Resultado atual da Elephant Bet: {novo_resultado} (Fonte: {resultados_anteriores['fonte']})")
+        elephant_cache_expira = time.monotonic() + ELEPHANT_CACHE_TTL
         
-    except Exception as e:
-        logger.error(f"Erro ao obter resultados da Elephant Bet: {e}")
-        # Em caso de erro, mantém os resultados anteriores
-    
     return resultados_anteriores
 
 # Nova abordagem sem foco em gales
@@ -482,10 +989,191 @@ modo_defensivo = False
 
 # Novas variáveis para controlar estratégias avançadas
 USAR_SEQUENCIA_LARANJA = True  # Sempre incluir laranja em combinações
-PADRAO_ATUAL = "COMBINAÇÃO"   # Pode ser "COMBINAÇÃO", "ALTERNADO", "REPETIDO"
+class Padrao(IntEnum):
+    COMBINACAO = 0
+    ALTERNADO = 1
+    REPETIDO = 2
+
+PADRAO_ATUAL = Padrao.COMBINACAO  # Alterna ciclicamente entre os padrões após erros
 ultima_cor_sorteada = None
 cores_consecutivas = 0         # Contador de cores iguais consecutivas
-combinacoes_vencedoras = []    # Lista de combinações que têm funcionado bem
+combinacoes_vencedoras = set()  # Conjunto de combinações que têm funcionado bem
+
+# Tabelas de decisão pré-computadas das estratégias
+
+# Após 3+ resultados iguais, por (cor repetida, modo defensivo); sequências de
+# laranja dependem do horário e são tratadas à parte
+PALPITE_APOS_SEQUENCIA = {
+    (Cor.AZUL, True): P_VM,         # Defensivo: cor oposta mais provável
+    (Cor.VERMELHO, True): P_AZ,
+    (Cor.AZUL, False): P_LA_VM,     # Normal: combinação com laranja
+    (Cor.VERMELHO, False): P_LA_AZ,
+}
+
+# Cor ausente nos últimos 5 resultados, por (cor ausente, modo defensivo)
+PALPITE_COR_AUSENTE = {
+    (Cor.LARANJA, True): P_LA,        # Defensivo: aposta direta na cor ausente
+    (Cor.AZUL, True): P_AZ,
+    (Cor.VERMELHO, True): P_VM,
+    (Cor.LARANJA, False): P_LA,       # Laranja ausente - aposta direta tem alta taxa de acerto
+    (Cor.AZUL, False): P_LA_AZ,       # Combinações que incluem a cor ausente
+    (Cor.VERMELHO, False): P_LA_VM,
+}
+
+# Estratégia da tarde: último resultado em alternância e tendência sem alternância
+PALPITE_APOS_ALTERNANCIA = {
+    Cor.AZUL: P_LA_VM,
+    Cor.VERMELHO: P_LA_AZ,
+}
+PALPITE_POR_TENDENCIA = {
+    Cor.AZUL: P_LA_AZ,
+    Cor.VERMELHO: P_LA_VM,
+    Cor.LARANJA: P_LA,
+}
+
+# Dados da rodada usados pelas estratégias de cada período do dia
+ContextoEstrategia = collections.namedtuple(
+    'ContextoEstrategia',
+    ['ultimos', 'tendencia', 'minuto_atual', 'modo_defensivo', 'ultimo_palpite']
+)
+
+# Estratégias por período do dia
+# Manhã (6-12h): Maior frequência de azul e alternâncias
+# Tarde (12-18h): Padrões mais regulares, frequência equilibrada
+# Noite (18-0h): Maior frequência de vermelho, padrões mais longos
+# Madrugada (0-6h): Comportamento irregular, maior frequência de laranja
+
+def estrategia_manha(ctx):
+    """Estratégia do período da manhã (6-12h)"""
+    if ctx.modo_defensivo:
+        # Manhã em modo defensivo - azul tem maior probabilidade
+        return P_AZ
+    # Maior taxa de acerto com Laranja+Azul durante a manhã
+    return P_LA_AZ
+
+def estrategia_tarde(ctx):
+    """Estratégia do período da tarde (12-18h)"""
+    ultimos = ctx.ultimos
+    # Analisamos o padrão recente para determinar a melhor estratégia
+    if len(ultimos) >= 3:
+        # Verifica alternância recente
+        if ultimos[-1] != ultimos[-2]:
+            # Padrão de alternância - continuar com combinação
+            if ultimos[-1] == Cor.LARANJA:
+                # Após laranja, escolher com base no minuto (variação cíclica)
+                return P_LA_VM if ctx.minuto_atual % 2 == 0 else P_LA_AZ
+            return PALPITE_APOS_ALTERNANCIA[ultimos[-1]]
+        else:
+            # Sem alternância clara - usar tendência
+            return PALPITE_POR_TENDENCIA[ctx.tendencia]
+    # Poucos dados - estratégia segura
+    return P_LA_AZ
+
+def estrategia_noite(ctx):
+    """Estratégia do período da noite (18-24h)"""
+    if ctx.modo_defensivo:
+        # Noite em modo defensivo - vermelho tem maior probabilidade
+        return P_VM
+    # Estratégia noturna - vermelho mais frequente
+    # Evita repetição se o último palpite foi este mesmo
+    if ctx.ultimo_palpite is P_LA_VM:
+        return P_LA_AZ
+    return P_LA_VM
+
+def estrategia_madrugada(ctx):
+    """Estratégia do período da madrugada (0-6h)"""
+    if ctx.modo_defensivo:
+        # Madrugada imprevisível - laranja é mais seguro
+        return P_LA
+    
+    # Melhor estratégia para madrugada baseada no minuto (aumenta variação)
+    # Com proteção anti-repetição
+    if ctx.minuto_atual < 20:
+        palpite = P_LA_AZ
+    elif ctx.minuto_atual < 40:
+        palpite = P_LA_VM
+    else:
+        palpite = P_LA
+    
+    # Se for repetição, o chamador sorteia outra opção (ver decidir_palpite)
+    return palpite
+
+# Nome do período de cada estratégia, para o log feito por quem chama decidir_palpite
+PERIODO_ESTRATEGIA = {
+    estrategia_manha: "manhã",
+    estrategia_tarde: "tarde",
+    estrategia_noite: "noite",
+    estrategia_madrugada: "madrugada",
+}
+
+# Tabela de despacho indexada pela hora do dia (0-23)
+ESTRATEGIA_POR_HORA = (
+    [estrategia_madrugada] * 6 +
+    [estrategia_manha] * 6 +
+    [estrategia_tarde] * 6 +
+    [estrategia_noite] * 6
+)
+
+@functools.lru_cache(maxsize=256)
+def decidir_palpite(ultimos, tendencia, modo_defensivo, hora_atual, minuto_atual, ultimo_palpite):
+    """
+    Parte determinística da estratégia de alta assertividade, memoizada pelas
+    entradas: rodadas com os mesmos dados reaproveitam a decisão anterior.
+    Não registra logs (seriam omitidos nos acertos do cache): o motivo da
+    decisão é devolvido para o chamador registrar
+    
+    Args:
+        ultimos: Tupla com os últimos 5 resultados (Cor)
+        tendencia: Cor com maior frequência recente
+        modo_defensivo: Se o modo defensivo está ativo
+        hora_atual: Hora atual (0-23)
+        minuto_atual: Minuto atual (0-59)
+        ultimo_palpite: Último palpite enviado ou None
+    
+    Returns:
+        tuple: (Palpite, se o chamador deve sortear outra opção por repetição,
+                motivo da decisão como (formato, argumento) para o log)
+    """
+    # 1. Detecção de sequências - se houver 3+ resultados iguais consecutivos
+    if len(ultimos) >= 3 and ultimos[-1] == ultimos[-2] == ultimos[-3]:
+        cor_repetida = ultimos[-1]
+        motivo = ("Detectada sequência de 3+ resultados iguais: %s", COR_EMOJI[cor_repetida])
+        
+        # Após sequência longa, estratégia diferenciada
+        if cor_repetida == Cor.LARANJA:
+            if modo_defensivo:
+                # Após sequência de laranjas, escolhemos entre azul e vermelho com base no horário
+                palpite = P_VM if hora_atual >= 12 else P_AZ
+            else:
+                # Após laranjas, alternamos entre as combinações com base nos minutos
+                palpite = P_LA_VM if minuto_atual % 2 == 0 else P_LA_AZ
+        else:
+            palpite = PALPITE_APOS_SEQUENCIA[(cor_repetida, modo_defensivo)]
+        return palpite, False, motivo
+    
+    # 2. Análise de ausência - quando uma cor está ausente por longo período
+    if len(ultimos) >= 5:
+        contador = dict.fromkeys((Cor.VERMELHO, Cor.AZUL, Cor.LARANJA), 0)
+        for resultado in ultimos:  # Últimos 5 resultados
+            contador[resultado] += 1
+        
+        # Detecta cor ausente nos últimos 5 resultados
+        ausentes = [cor for cor, count in contador.items() if count == 0]
+        if ausentes:
+            cor_ausente = ausentes[0]  # Pega a primeira cor ausente
+            motivo = ("Detectada cor ausente nos últimos 5 resultados: %s", COR_EMOJI[cor_ausente])
+            return PALPITE_COR_AUSENTE[(cor_ausente, modo_defensivo)], False, motivo
+    
+    # 3. Estratégia baseada no ciclo do dia (padrões observados em diferentes horários)
+    # Despacho direto pela hora na tabela pré-computada ESTRATEGIA_POR_HORA
+    estrategia = ESTRATEGIA_POR_HORA[hora_atual]
+    ctx = ContextoEstrategia(ultimos, tendencia, minuto_atual, modo_defensivo, ultimo_palpite)
+    palpite = estrategia(ctx)
+    motivo = ("Aplicando estratégia do período da %s", PERIODO_ESTRATEGIA[estrategia])
+    # Na madrugada, repetir o último palpite pede uma variação aleatória, exceto
+    # no modo defensivo, que mantém sempre o laranja
+    variar = not modo_defensivo and estrategia is estrategia_madrugada and palpite is ultimo_palpite
+    return palpite, variar, motivo
 
 # Estratégia de alta assertividade vinculada à Elephant Bet
 def estrategia_alta_assertividade():
@@ -502,12 +1190,12 @@ def estrategia_alta_assertividade():
     try:
         # Definimos o conjunto de estratégias possíveis com maior diversificação
         estrategias = [
-            '🟠+🔵 Laranja e Azul',     # Combinação Laranja+Azul
-            '🟠+🔴 Laranja e Vermelho',  # Combinação Laranja+Vermelho
-            '🟠 Laranja',                # Apenas Laranja (empate)
-            '🔵 Azul',                   # Apenas Azul
-            '🔴 Vermelho',               # Apenas Vermelho
-            '🔵+🔴 Azul e Vermelho'      # Nova combinação para maior diversidade de estratégias
+            P_LA_AZ,    # Combinação Laranja+Azul
+            P_LA_VM,    # Combinação Laranja+Vermelho
+            P_LA,       # Apenas Laranja (empate)
+            P_AZ,       # Apenas Azul
+            P_VM,       # Apenas Vermelho
+            P_AZ_VM     # Nova combinação para maior diversidade de estratégias
         ]
         
         # Lista para rastrear palpites recentes e evitar repetições
@@ -517,8 +1205,9 @@ def estrategia_alta_assertividade():
         try:
             from prediction_generator import ultimo_palpite as ultimo_pred
             if ultimo_pred is not None:
-                ultimo_palpite = ultimo_pred
-                logger.info(f"Último palpite obtido do módulo prediction_generator: {ultimo_palpite}")
+                # Interna o valor externo para que as comparações por identidade funcionem
+                ultimo_palpite = sys.intern(ultimo_pred)
+                logger.info("Último palpite obtido do módulo prediction_generator: %s", ultimo_palpite)
         except (ImportError, AttributeError):
             # Se falhar, vamos tentar encontrar de outra forma
             pass
@@ -526,15 +1215,16 @@ def estrategia_alta_assertividade():
         # Atualiza os resultados com o algoritmo avançado
         atualizar_resultados_elephant()
         
-        # Extrai dados para análise
-        ultimos = resultados_anteriores['ultimos_10']
-        tendencia = resultados_anteriores['tendencia']
+        # Extrai dados para análise, convertendo as cores para o enum uma única vez
+        ultimos = [COLOR_IDX[cor] for cor in resultados_anteriores['ultimos_10']]
+        tendencia = COLOR_IDX[resultados_anteriores['tendencia']]
         frequencia = resultados_anteriores['frequencia']
         
         # Obtenção de parâmetros temporais para estratégia adaptativa
-        hora_atual = int(time.strftime('%H'))
-        minuto_atual = int(time.strftime('%M'))
-        dia_semana = datetime.datetime.today().weekday()  # 0-6 (Segunda-Domingo)
+        agora = datetime.datetime.now()
+        hora_atual = agora.hour
+        minuto_atual = agora.minute
+        dia_semana = agora.weekday()  # 0-6 (Segunda-Domingo)
         
         # Verificamos se precisa entrar em modo defensivo
         if contagem_gales >= max_gales:
@@ -546,217 +1236,229 @@ def estrategia_alta_assertividade():
         estrategias_filtradas = estrategias.copy()
         if ultimo_palpite in estrategias_filtradas and len(estrategias_filtradas) > 1:
             estrategias_filtradas.remove(ultimo_palpite)
-            logger.info(f"Evitando repetição do último palpite: {ultimo_palpite}")
+            logger.info("Evitando repetição do último palpite: %s", ultimo_palpite)
         
-        # ANÁLISE DE PADRÕES AVANÇADA
-        
-        # 1. Detecção de sequências - se houver 3+ resultados iguais consecutivos
-        if len(ultimos) >= 3 and ultimos[-1] == ultimos[-2] == ultimos[-3]:
-            cor_repetida = ultimos[-1]
-            logger.info(f"Detectada sequência de 3+ resultados iguais: {cor_repetida}")
-            
-            # Após sequência longa, estratégia diferenciada
-            if modo_defensivo:
-                # Em modo defensivo, apostamos diretamente na cor oposta mais provável
-                if cor_repetida == '🔵':
-                    # Após sequência de azuis, apostamos no vermelho
-                    return '🔴 Vermelho', contagem_gales, modo_defensivo
-                elif cor_repetida == '🔴':
-                    # Após sequência de vermelhos, apostamos no azul
-                    return '🔵 Azul', contagem_gales, modo_defensivo
-                else:
-                    # Após sequência de laranjas, escolhemos entre azul e vermelho com base no horário
-                    return '🔴 Vermelho' if hora_atual >= 12 else '🔵 Azul', contagem_gales, modo_defensivo
-            else:
-                # Em modo normal, apostamos em combinação com laranja
-                if cor_repetida == '🔵':
-                    # Após azuis, apostar em Laranja+Vermelho pra variar
-                    return '🟠+🔴 Laranja e Vermelho', contagem_gales, modo_defensivo
-                elif cor_repetida == '🔴':
-                    # Após vermelhos, apostar em Laranja+Azul
-                    return '🟠+🔵 Laranja e Azul', contagem_gales, modo_defensivo
-                else:
-                    # Após laranjas, alternamos entre as combinações com base nos minutos
-                    return '🟠+🔴 Laranja e Vermelho' if minuto_atual % 2 == 0 else '🟠+🔵 Laranja e Azul', contagem_gales, modo_defensivo
-        
-        # 2. Análise de ausência - quando uma cor está ausente por longo período
-        if len(ultimos) >= 5:
-            contador = {'🔴': 0, '🔵': 0, '🟠': 0}
-            for resultado in ultimos[-5:]:  # Últimos 5 resultados
-                contador[resultado] += 1
-            
-            # Detecta cor ausente nos últimos 5 resultados
-            ausentes = [cor for cor, count in contador.items() if count == 0]
-            if ausentes:
-                cor_ausente = ausentes[0]  # Pega a primeira cor ausente
-                logger.info(f"Detectada cor ausente nos últimos 5 resultados: {cor_ausente}")
-                
-                if modo_defensivo:
-                    # Em modo defensivo, apostamos diretamente na cor ausente
-                    if cor_ausente == '🟠':
-                        return '🟠 Laranja', contagem_gales, modo_defensivo
-                    elif cor_ausente == '🔵':
-                        return '🔵 Azul', contagem_gales, modo_defensivo
-                    else:
-                        return '🔴 Vermelho', contagem_gales, modo_defensivo
-                else:
-                    # Combinações que incluem a cor ausente
-                    if cor_ausente == '🟠':
-                        # Laranja ausente - apostar diretamente nela tem alta taxa de acerto
-                        return '🟠 Laranja', contagem_gales, modo_defensivo
-                    elif cor_ausente == '🔵':
-                        return '🟠+🔵 Laranja e Azul', contagem_gales, modo_defensivo
-                    else:  # Vermelho ausente
-                        return '🟠+🔴 Laranja e Vermelho', contagem_gales, modo_defensivo
-        
-        # 3. Estratégia baseada no ciclo do dia (padrões observados em diferentes horários)
-        # Manhã (6-12h): Maior frequência de azul e alternâncias
-        # Tarde (12-18h): Padrões mais regulares, frequência equilibrada
-        # Noite (18-0h): Maior frequência de vermelho, padrões mais longos
-        # Madrugada (0-6h): Comportamento irregular, maior frequência de laranja
+        # ANÁLISE DE PADRÕES AVANÇADA (memoizada pelas entradas da rodada)
+        palpite, variar, motivo = decidir_palpite(
+            tuple(ultimos[-5:]), tendencia, modo_defensivo, hora_atual, minuto_atual, ultimo_palpite
+        )
+        logger.info(*motivo)
         
-        if 6 <= hora_atual < 12:  # Manhã
-            logger.info("Aplicando estratégia do período da manhã")
-            if modo_defensivo:
-                # Manhã em modo defensivo - azul tem maior probabilidade
-                return '🔵 Azul', contagem_gales, modo_defensivo
-            else:
-                # Maior taxa de acerto com Laranja+Azul durante a manhã
-                return '🟠+🔵 Laranja e Azul', contagem_gales, modo_defensivo
-                
-        elif 12 <= hora_atual < 18:  # Tarde
-            logger.info("Aplicando estratégia do período da tarde")
-            # Analisamos o padrão recente para determinar a melhor estratégia
-            if len(ultimos) >= 3:
-                # Verifica alternância recente
-                if ultimos[-1] != ultimos[-2]:
-                    # Padrão de alternância - continuar com combinação
-                    if ultimos[-1] == '🔵':
-                        return '🟠+🔴 Laranja e Vermelho', contagem_gales, modo_defensivo
-                    elif ultimos[-1] == '🔴':
-                        return '🟠+🔵 Laranja e Azul', contagem_gales, modo_defensivo
-                    else:
-                        # Após laranja, escolher com base no minuto (variação cíclica)
-                        return '🟠+🔴 Laranja e Vermelho' if minuto_atual % 2 == 0 else '🟠+🔵 Laranja e Azul', contagem_gales, modo_defensivo
-                else:
-                    # Sem alternância clara - usar tendência
-                    if tendencia == '🔵':
-                        return '🟠+🔵 Laranja e Azul', contagem_gales, modo_defensivo
-                    elif tendencia == '🔴':
-                        return '🟠+🔴 Laranja e Vermelho', contagem_gales, modo_defensivo
-                    else:
-                        return '🟠 Laranja', contagem_gales, modo_defensivo
-            else:
-                # Poucos dados - estratégia segura
-                return '🟠+🔵 Laranja e Azul', contagem_gales, modo_defensivo
-                
-        elif 18 <= hora_atual < 24:  # Noite
-            logger.info("Aplicando estratégia do período da noite")
-            if modo_defensivo:
-                # Noite em modo defensivo - vermelho tem maior probabilidade
-                return '🔴 Vermelho', contagem_gales, modo_defensivo
-            else:
-                # Estratégia noturna - vermelho mais frequente
-                # Evita repetição se o último palpite foi este mesmo
-                if ultimo_palpite == '🟠+🔴 Laranja e Vermelho':
-                    return '🟠+🔵 Laranja e Azul', contagem_gales, modo_defensivo
-                else:
-                    return '🟠+🔴 Laranja e Vermelho', contagem_gales, modo_defensivo
-                
-        else:  # Madrugada (0-6h)
-            logger.info("Aplicando estratégia do período da madrugada")
-            if modo_defensivo:
-                # Madrugada imprevisível - laranja é mais seguro
-                return '🟠 Laranja', contagem_gales, modo_defensivo
-            else:
-                # Melhor estratégia para madrugada baseada no minuto (aumenta variação)
-                # Com proteção anti-repetição
-                if minuto_atual < 20:
-                    palpite = '🟠+🔵 Laranja e Azul'
-                elif minuto_atual < 40:
-                    palpite = '🟠+🔴 Laranja e Vermelho'
-                else:
-                    palpite = '🟠 Laranja'
-                
-                # Se for repetição, varia
-                if palpite == ultimo_palpite:
-                    # Escolhe outra opção
-                    remaining = [p for p in estrategias_filtradas if p != palpite]
-                    if remaining:
-                        palpite = random.choice(remaining)
-                
-                return palpite, contagem_gales, modo_defensivo
+        # O sorteio anti-repetição fica fora do cache para não congelar o gerador aleatório
+        if variar:
+            remaining = [p for p in estrategias_filtradas if p is not palpite]
+            if remaining:
+                palpite = obter_rng().choice(remaining)
         
-        # 4. Estratégia padrão caso nenhuma condição especial seja atendida
-        # Baseada na tendência atual (mais comum nos últimos resultados)
-        # Geralmente não chegamos aqui devido às condições acima
+        return palpite, contagem_gales, modo_defensivo
         
-        logger.info("Aplicando estratégia baseada na tendência atual")
-        if tendencia == '🔵':
-            if modo_defensivo:
-                return '🔵 Azul', contagem_gales, modo_defensivo
-            else:
-                # Evita repetição
-                if ultimo_palpite == '🟠+🔵 Laranja e Azul':
-                    return '🟠+🔴 Laranja e Vermelho', contagem_gales, modo_defensivo
-                else:
-                    return '🟠+🔵 Laranja e Azul', contagem_gales, modo_defensivo
-        elif tendencia == '🔴':
-            if modo_defensivo:
-                return '🔴 Vermelho', contagem_gales, modo_defensivo
-            else:
-                # Evita repetição
-                if ultimo_palpite == '🟠+🔴 Laranja e Vermelho':
-                    return '🟠+🔵 Laranja e Azul', contagem_gales, modo_defensivo
-                else:
-                    return '🟠+🔴 Laranja e Vermelho', contagem_gales, modo_defensivo
-        else:  # Tendência laranja
-            if modo_defensivo:
-                return '🟠 Laranja', contagem_gales, modo_defensivo
-            else:
-                # Variar entre as combinações para maior cobertura, evitando repetições
-                combinacoes = ['🟠+🔵 Laranja e Azul', '🟠+🔴 Laranja e Vermelho']
-                if ultimo_palpite in combinacoes:
-                    combinacoes.remove(ultimo_palpite)
-                    return combinacoes[0], contagem_gales, modo_defensivo
-                else:
-                    return random.choice(combinacoes), contagem_gales, modo_defensivo
-                    
     except Exception as e:
         # Tratamento robusto de erros - garante que sempre retorna algo válido
-        logger.error(f"Erro na estratégia de alta assertividade: {e}")
+        logger.error("Erro na estratégia de alta assertividade: %s", e)
         
         # Importa funções de fallback do prediction_generator como backup
         try:
             from prediction_generator import generate_intelligent_prediction
             palpite = generate_intelligent_prediction()
-            logger.info(f"Usando prediction_generator como fallback: {palpite}")
+            logger.info("Usando prediction_generator como fallback: %s", palpite)
             return palpite, contagem_gales, modo_defensivo
         except ImportError:
             # Se nem isso funcionar, usa valores seguros
             logger.warning("Usando estratégia de fallback de emergência")
-            return random.choice(['🟠+🔵 Laranja e Azul', '🟠+🔴 Laranja e Vermelho']), contagem_gales, modo_defensivo
+            return obter_rng().choice(COMBINACOES), contagem_gales, modo_defensivo
 
 # Emojis para reações
 REACTION_EMOJIS = {
-    "like": "👍",
-    "love": "❤️",
-    "fire": "🔥",
-    "thinking": "🤔",
-    "sad": "😢",
-    "angry": "😡",
-    "money": "💰",
-    "lucky": "🍀"
+    "like": sys.intern("👍"),
+    "love": sys.intern("❤️"),
+    "fire": sys.intern("🔥"),
+    "thinking": sys.intern("🤔"),
+    "sad": sys.intern("😢"),
+    "angry": sys.intern("😡"),
+    "money": sys.intern("💰"),
+    "lucky": sys.intern("🍀")
 }
 
+# Contagem zerada de reações, copiada para cada nova mensagem de palpite
+REACTION_ZERO = dict.fromkeys(REACTION_EMOJIS.values(), 0)
+
+# Teclados inline montados uma única vez e reaproveitados em todos os envios
+def criar_botao_jogar():
+    """Cria o botão com o link para jogar na Elephant Bet"""
+    return telebot.types.InlineKeyboardButton(
+        text="🎮 JOGA AGORA! 🎯🔥💰",
+        url="https://elephant.bet"  # substitui pelo teu link de afiliado se tiver
+    )
+
+REACTION_BUTTONS = [
+    telebot.types.InlineKeyboardButton(emoji, callback_data=f"reaction_{key}")
+    for key, emoji in REACTION_EMOJIS.items()
+]
+
+# Canal: 4 emojis na primeira linha e o link na segunda
+CHANNEL_MARKUP = telebot.types.InlineKeyboardMarkup(row_width=4)
+CHANNEL_MARKUP.add(*REACTION_BUTTONS[:4])
+CHANNEL_MARKUP.add(criar_botao_jogar())
+
+# Mensagem direta: todos os emojis de reação em duas linhas
+DM_MARKUP = telebot.types.InlineKeyboardMarkup(row_width=4)
+DM_MARKUP.add(*REACTION_BUTTONS[:4])
+DM_MARKUP.add(*REACTION_BUTTONS[4:])
+
+# Apenas o botão para jogar
+JOGAR_MARKUP = telebot.types.InlineKeyboardMarkup()
+JOGAR_MARKUP.add(criar_botao_jogar())
+
 # Armazena as mensagens enviadas e reações recebidas
-# formato: {message_id: {"prediction": "cor", "reactions": {"emoji": count}}}
-prediction_messages = {}
+# formato: {message_id: {"prediction": "cor", "base_text": "texto", "reactions": {"emoji": count}}}
+# Limitado às MAX_PREDICTION_MESSAGES mais recentes para não crescer indefinidamente
+MAX_PREDICTION_MESSAGES = 500
+prediction_messages = collections.OrderedDict()
+prediction_messages_lock = threading.Lock()
+
+# Total de reações por emoji, atualizado a cada clique (não perde as mensagens já descartadas)
+reaction_totals = collections.Counter()
+
+def registrar_mensagem_palpite(message_id, palpite, base_text, parse_mode=None):
+    """
+    Registra uma mensagem de palpite para acompanhar as reações, descartando
+    as mais antigas quando o limite é ultrapassado
+    
+    Args:
+        message_id: ID da mensagem enviada
+        palpite: Palpite contido na mensagem
+        base_text: Texto original da mensagem, sem a seção de reações
+        parse_mode: Modo de formatação usado no envio (reaplicado nas edições)
+    """
+    with prediction_messages_lock:
+        prediction_messages[message_id] = {
+            "prediction": palpite,
+            "base_text": base_text,
+            "parse_mode": parse_mode,
+            "reactions": REACTION_ZERO.copy(),
+            "edicao_pendente": False  # Há uma edição de reações agendada
+        }
+        prediction_messages.move_to_end(message_id)
+        while len(prediction_messages) > MAX_PREDICTION_MESSAGES:
+            prediction_messages.popitem(last=False)
+
+def enviar_previsao(destino, texto, palpite, markup, parse_mode=None, disable_notification=False):
+    """
+    Envia uma mensagem de palpite e a registra para acompanhar as reações
+    
+    Args:
+        destino: ID do canal ou chat de destino
+        texto: Texto da mensagem
+        palpite: Palpite contido na mensagem
+        markup: Teclado inline com os botões de reação
+        parse_mode: Modo de formatação do texto (None para texto puro)
+        disable_notification: Envia sem som/alerta (palpites em série)
+    
+    Returns:
+        int: ID da mensagem enviada
+    
+    Raises:
+        Exception: Os erros da API são propagados para o chamador decidir como tratar
+    """
+    sent_msg = bot.send_message(destino, texto, reply_markup=markup, parse_mode=parse_mode,
+                                disable_notification=disable_notification)
+    registrar_mensagem_palpite(sent_msg.message_id, palpite, texto, parse_mode)
+    return sent_msg.message_id
+
+# Loop de eventos compartilhado para as animações de palpite e o monitoramento:
+# as pausas são asyncio.sleep e não ocupam uma thread por chat
+animation_loop = asyncio.new_event_loop()
+animation_loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(
+    max_workers=NUM_THREADS_HANDLERS, thread_name_prefix="Handler"))
+threading.Thread(target=animation_loop.run_forever, name="AnimationLoop", daemon=True).start()
+
+# Filas de atualizações por chat: mantêm a ordem dentro de cada chat enquanto
+# chats diferentes são atendidos em paralelo. Acessadas só pelo animation_loop
+filas_por_chat = {}
+
+# Tempo (s) sem atualizações após o qual a tarefa de um chat é encerrada
+FILA_CHAT_OCIOSA = 60
+
+def chave_fila_chat(args):
+    """
+    Retorna a chave da fila dos argumentos de uma tarefa do bot: o chat de uma
+    Message ou o usuário de uma CallbackQuery (reações no canal não ficam
+    enfileiradas juntas)
+    
+    Args:
+        args: Argumentos posicionais passados a _exec_task
+    
+    Returns:
+        int: ID do chat/usuário, ou None se o primeiro argumento não for uma
+             Message ou CallbackQuery (por exemplo, a lista dos listeners)
+    """
+    if not args:
+        return None
+    atualizacao = args[0]
+    if isinstance(atualizacao, telebot.types.Message):
+        return atualizacao.chat.id
+    if isinstance(atualizacao, telebot.types.CallbackQuery):
+        return atualizacao.from_user.id
+    return None
+
+def despachar_para_chat(chave, task, args, kwargs):
+    """Enfileira um handler na fila do chat, criando a tarefa consumidora se preciso"""
+    fila = filas_por_chat.get(chave)
+    if fila is None:
+        fila = filas_por_chat[chave] = asyncio.Queue()
+        animation_loop.create_task(consumir_fila_chat(chave, fila))
+    fila.put_nowait((task, args, kwargs))
+
+async def consumir_fila_chat(chave, fila):
+    """
+    Executa em ordem os handlers de um chat, cada um numa thread do executor,
+    e encerra após FILA_CHAT_OCIOSA segundos sem novas atualizações
+    """
+    while True:
+        try:
+            task, args, kwargs = await asyncio.wait_for(fila.get(), FILA_CHAT_OCIOSA)
+        except asyncio.TimeoutError:
+            if fila.empty():
+                del filas_por_chat[chave]
+                return
+            continue
+        try:
+            await asyncio.to_thread(task, *args, **kwargs)
+        except Exception as e:
+            # Mesmo tratamento do worker_pool: o exception_handler do bot tem a
+            # primeira chance e, se não tratar, o erro é registrado
+            if bot.exception_handler is None or not bot.exception_handler.handle(e):
+                logger.error("Erro no handler do chat %s: %s", chave, e)
+
+# Pool reutilizável para notificações e tarefas curtas disparadas pelos handlers,
+# em vez de criar uma thread nova a cada chamada
+NOTIFY_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=16, thread_name_prefix="Notify")
 
-def gerar_palpite_com_animacao(chat_id):
+def enviar_notificacao_segura(chat_id, texto, parse_mode="Markdown"):
+    """
+    Envia uma notificação registrando, sem propagar, qualquer falha
+    
+    Args:
+        chat_id: ID do chat de destino
+        texto: Texto da notificação
+        parse_mode: Modo de formatação do texto
+    
+    Returns:
+        bool: True se a mensagem foi enviada
+    """
+    try:
+        bot.send_message(chat_id, texto, parse_mode=parse_mode)
+        return True
+    except Exception as e:
+        logger.error(f"Não foi possível notificar {chat_id}: {e}")
+        return False
+
+async def gerar_palpite_com_animacao(chat_id):
     """
     Gera um palpite com animação de carregamento.
     Implementa sistema robusto de proteção a falhas.
+    Executa no animation_loop; as chamadas bloqueantes (API do Telegram e
+    estratégia) rodam via asyncio.to_thread para não travar o loop.
     
     Args:
         chat_id: ID do chat para enviar a animação
@@ -768,19 +1470,16 @@ def gerar_palpite_com_animacao(chat_id):
         # Registra atividade no sistema de monitoramento 24/7
         bot_monitor.register_activity()
         
-        # Emojis para animação
-        spinner_frames = ["⏳", "⌛", "⏳", "⌛"]
-        
         # Texto inicial
         mensagem = "🔄 Analisando padrões..."
         
         try:
-            msg = bot.send_message(chat_id, mensagem)
+            msg = await asyncio.to_thread(bot.send_message, chat_id, mensagem)
             logger.info(f"Iniciando animação de palpite para chat_id {chat_id}")
         except Exception as e:
             logger.error(f"Erro ao enviar mensagem inicial: {e}")
             # Fallback - prossegue sem animação
-            palpite_fallback = estrategia_alta_assertividade()
+            palpite_fallback = await asyncio.to_thread(estrategia_alta_assertividade)
             if isinstance(palpite_fallback, tuple):
                 palpite_str = palpite_fallback[0]
             else:
@@ -788,7 +1487,7 @@ def gerar_palpite_com_animacao(chat_id):
             
             # Tenta enviar o resultado diretamente
             try:
-                bot.send_message(chat_id, f"✨ Palpite gerado: {palpite_str} ✨")
+                await asyncio.to_thread(bot.send_message, chat_id, f"✨ Palpite gerado: {palpite_str} ✨")
             except:
                 pass
                 
@@ -796,38 +1495,20 @@ def gerar_palpite_com_animacao(chat_id):
             return palpite_fallback
         
         # Função auxiliar para atualizar texto com tratamento de erro
-        def update_text_safely(text):
+        async def update_text_safely(text):
             try:
-                bot.edit_message_text(text, chat_id, msg.message_id)
+                await asyncio.to_thread(bot.edit_message_text, text, chat_id, msg.message_id)
                 return True
             except Exception as e:
                 logger.debug(f"Erro ao atualizar animação (ignorável): {e}")
                 return False
         
-        # Animação ultra-rápida - resposta em menos de 5 segundos
-        for i in range(1):  # Apenas 1 iteração
-            for frame in spinner_frames[:2]:  # Apenas 2 frames
-                texto_atualizado = f"{frame} Analisando padrões... {frame}"
-                time.sleep(0.2)  # Apenas 0.2 segundos
-                update_text_safely(texto_atualizado)
-        
-        # Segunda animação - instantânea
-        update_text_safely("🧮 Calculando probabilidades...")
-        time.sleep(0.2)  # Apenas 0.2 segundos
-        
-        # Pulando para 50% e depois 100% para economizar tempo
-        for i in [50, 100]:
-            texto_atualizado = f"🧮 Calculando probabilidades... {i}%"
-            time.sleep(0.2)  # Apenas 0.2 segundos
-            update_text_safely(texto_atualizado)
-        
-        # Terceira animação - instantânea
-        update_text_safely("🎲 Gerando palpite final...")
-        time.sleep(0.3)  # Apenas 0.3 segundos
+        # Sem quadros intermediários: apenas a mensagem inicial e uma única edição
+        # final, para não estourar o limite de ~1 mensagem/s por chat do Telegram
         
         # Gera o palpite final - usando estratégia de alta assertividade
         try:
-            palpite_result = estrategia_alta_assertividade()
+            palpite_result = await asyncio.to_thread(estrategia_alta_assertividade)
             
             # Verifica se o retorno é uma tupla (formato esperado) ou apenas string
             if isinstance(palpite_result, tuple):
@@ -851,7 +1532,7 @@ def gerar_palpite_com_animacao(chat_id):
                 logger.info(f"Usando prediction_generator como fallback: {palpite}")
             except ImportError:
                 # Se nem isso funcionar, usa valores mais simples
-                palpite = random.choice(['🟠+🔵 Laranja e Azul', '🟠+🔴 Laranja e Vermelho'])
+                palpite = obter_rng().choice(COMBINACOES)
                 gales = 0
                 defesa = False
                 logger.warning(f"Usando palpite de emergência: {palpite}")
@@ -865,12 +1546,12 @@ def gerar_palpite_com_animacao(chat_id):
         
         # Animação final revelando o resultado
         texto_final = f"✨ Palpite gerado: {palpite} ✨{info_adicional}"
-        update_text_safely(texto_final)
-        time.sleep(1)
+        await update_text_safely(texto_final)
+        await asyncio.sleep(1)
         
         # Apaga a mensagem de animação
         try:
-            bot.delete_message(chat_id, msg.message_id)
+            await asyncio.to_thread(bot.delete_message, chat_id, msg.message_id)
         except Exception:
             # Se não puder apagar, ignora
             pass
@@ -888,83 +1569,156 @@ def gerar_palpite_com_animacao(chat_id):
         # Fallback final - sempre retorna algo válido
         try:
             # Notifica o usuário sobre o erro, de forma amigável
-            bot.send_message(
+            await asyncio.to_thread(
+                bot.send_message,
                 chat_id, 
                 "⚠️ Houve um pequeno problema na animação, mas seu palpite está pronto!"
             )
             
             # Gera um palpite de emergência
-            palpite_emergencia = random.choice(['🟠+🔵 Laranja e Azul', '🟠+🔴 Laranja e Vermelho'])
-            bot.send_message(chat_id, f"✨ Palpite: {palpite_emergencia} ✨")
+            palpite_emergencia = obter_rng().choice(COMBINACOES)
+            await asyncio.to_thread(bot.send_message, chat_id, f"✨ Palpite: {palpite_emergencia} ✨")
             
             # Registra o problema
             logger.warning(f"Usando palpite de emergência após falha: {palpite_emergencia}")
             return palpite_emergencia, 0, False
         except:
             # Se absolutamente tudo falhar
-            return '🟠+🔵 Laranja e Azul', 0, False
+            return P_LA_AZ, 0, False
+
+def gerar_palpite():
+    """
+    Versão simples sem animação - usa estratégia de alta assertividade (95%)
+    """
+    return estrategia_alta_assertividade()
+
+def calcular_taxa(greens_seguidos):
+    """
+    Taxa exibida: 50% iniciais mais 2% por green consecutivo, com bônus máximo de 49%
+    
+    Args:
+        greens_seguidos: Quantidade de acertos consecutivos
+    
+    Returns:
+        float: Taxa de assertividade em porcentagem
+    """
+    return 50.0 + (49.0 if greens_seguidos >= 25 else greens_seguidos * 2.0)
+
+# Intervalo (s) entre os palpites enviados ao canal
+INTERVALO_PALPITES = 25
+
+# Modelos das mensagens de placar, preenchidos com format_map
+PLACAR_TEMPLATE = """
+🏆 *PLACAR GERAL - BAC BO* 🏆
+
+✅ Greens consecutivos: {greens_seguidos}
+❌ Reds consecutivos: {reds_seguidos}
+🔄 Maior sequência de greens: {max_greens_seguidos}/{meta_acertos_consecutivos}
+🔄 Maior sequência de reds: {max_reds_seguidos}
+
+🎯 Progresso: {acertos}/{meta_total_acertos} acertos totais
+
+📊 Estatísticas gerais:
+- Total de palpites: {total}
+- Acertos: {acertos}
+- Erros: {erros}
+- Taxa de acerto: {taxa:.1f}%
+
+⏰ {hora}
+"""
+
+REINICIO_TEMPLATE = """
+🔄 *REINÍCIO DO PLACAR* 🔄
+
+Atingimos o limite de contagem!
+✅ Total de acertos: {acertos}
+❌ Total de erros: {erros}
+📊 Total de palpites: {total}
+💯 Taxa de acerto: {taxa:.1f}%
+🏆 Maior sequência de greens: {max_greens}
+🏆 Maior sequência de reds: {max_reds}
+
+O placar será reiniciado para uma nova contagem.
+"""
 
-def gerar_palpite():
-    """
-    Versão simples sem animação - usa estratégia de alta assertividade (95%)
-    """
-    return estrategia_alta_assertividade()
+# Mensagens de acerto variadas e mais empolgantes
+MSGS_ACERTO = (
+    "✅ ACERTAMOS! 🔥 SEQUÊNCIA DETECTADA!",
+    "✅ GREEN CONFIRMADO! 🚀 SEQUÊNCIA QUENTE!",
+    "✅ ACERTAMOS NOVAMENTE! 💰 PADRÃO IDENTIFICADO!",
+    "✅ GREEN GARANTIDO! 🤑 LUCRO NA CONTA!",
+    "✅ ACERTAMOS! 💎 ESTRATÉGIA FUNCIONANDO PERFEITAMENTE!"
+)
+
+# Mensagens de consolo quando erra
+MSGS_ERRO = (
+    "❌ Erramos - A mesa está difícil hoje! 😤",
+    "❌ Erramos - Esta mesa está manipulada! 😠",
+    "❌ Erramos - Não desanime, vamos recuperar! 💪",
+    "❌ Erramos - Mesa bagunçando o padrão! 🤬",
+    "❌ Erramos - Alterando a estratégia! 🔄"
+)
+
+# Mensagens adicionais consoladoras após um erro
+MSGS_ADICIONAL = (
+    "Não desista, o próximo GREEN vem forte! 💪",
+    "Sabemos o jogo deles, vamos dar a volta! 🔄",
+    "A mesa está tentando nos enganar! 👀",
+    "Mantenha o controle emocional! 🧘‍♂️",
+    "Nossa estratégia é superior, confia! 💯"
+)
 
 def enviar_palpite():
     global acertos, erros, total, PRIMEIRO_USUARIO_ID, contagem_gales, modo_defensivo
     global greens_seguidos, max_greens_seguidos, reds_seguidos, max_reds_seguidos
     
-    # Lista de IDs de canal para tentar
-    canal_ids = [CANAL_ID, CANAL_ID_ALT, '@bacboprediction1']
-    
     # Registra atividade no sistema de monitoramento 24/7
     bot_monitor.register_activity()
     
-    # Variáveis para controlar o placar a cada 10 minutos
-    ultimo_placar = datetime.datetime.now()
+    # Variáveis para controlar o placar a cada 10 minutos (relógio monotônico)
+    ultimo_placar = time.monotonic()
+    
+    # Erros consecutivos no ciclo, usados no backoff exponencial
+    falhas_seguidas = 0
     
     while bot_monitor.running:
         try:
             # Verifica se passou 10 minutos desde o último placar
-            agora = datetime.datetime.now()
-            tempo_passado = (agora - ultimo_placar).total_seconds()
+            agora = time.monotonic()
+            tempo_passado = agora - ultimo_placar
             
             if tempo_passado >= 600:  # 10 minutos = 600 segundos
                 # Chegou a hora de enviar o placar!
                 taxa = (acertos / total) * 100 if total > 0 else 0
                 
-                mensagem_placar = f"""
-🏆 *PLACAR GERAL - BAC BO* 🏆
-
-✅ Greens consecutivos: {greens_seguidos}
-❌ Reds consecutivos: {reds_seguidos}
-🔄 Maior sequência de greens: {max_greens_seguidos}/{meta_acertos_consecutivos}
-🔄 Maior sequência de reds: {max_reds_seguidos}
-
-🎯 Progresso: {acertos}/{meta_total_acertos} acertos totais
-
-📊 Estatísticas gerais:
-- Total de palpites: {total}
-- Acertos: {acertos}
-- Erros: {erros}
-- Taxa de acerto: {taxa:.1f}%
-
-⏰ {agora.strftime('%H:%M:%S')}
-"""
+                mensagem_placar = PLACAR_TEMPLATE.format_map({
+                    'greens_seguidos': greens_seguidos,
+                    'reds_seguidos': reds_seguidos,
+                    'max_greens_seguidos': max_greens_seguidos,
+                    'max_reds_seguidos': max_reds_seguidos,
+                    'meta_acertos_consecutivos': meta_acertos_consecutivos,
+                    'meta_total_acertos': meta_total_acertos,
+                    'acertos': acertos,
+                    'erros': erros,
+                    'total': total,
+                    'taxa': taxa,
+                    'hora': now_hms(),
+                })
                 
                 # Tenta enviar o placar
-                for canal_id in canal_ids:
+                for canal_id in canais_para_envio():
                     try:
-                        bot.send_message(canal_id, mensagem_placar, parse_mode='Markdown')
-                        logger.info(f"Placar enviado com sucesso para o canal {canal_id}")
+                        bot.send_message(canal_id, mensagem_placar, parse_mode='Markdown', disable_notification=True)
+                        logger.info("Placar enviado com sucesso para o canal %s", canal_id)
                         
                         # Aguarda 30 segundos após o placar antes de enviar o próximo palpite
                         logger.info("Aguardando 30 segundos após o placar antes do próximo palpite...")
-                        time.sleep(30)
+                        if bot_monitor.stop_event.wait(30):
+                            return
                         
                         break  # Conseguiu enviar, sai do loop
                     except Exception as e:
-                        logger.error(f"Erro ao enviar placar para o canal {canal_id}: {e}")
+                        logger.error("Erro ao enviar placar para o canal %s: %s", canal_id, e)
                 
                 # Atualiza o timestamp do último placar
                 ultimo_placar = agora
@@ -972,38 +1726,26 @@ def enviar_palpite():
             # Verifica se atingiu o limite para reiniciar o placar (150 acertos e 50 erros)
             # Não interrompe o fluxo de palpites, apenas zera os contadores
             if acertos >= 150 and erros >= 50 and total > 0:
-                # Envia mensagem sobre o reinício do placar
-                mensagem_reinicio = f"""
-🔄 *REINÍCIO DO PLACAR* 🔄
-
-Atingimos o limite de contagem!
-✅ Total de acertos: {old_acertos}
-❌ Total de erros: {old_erros}
-📊 Total de palpites: {old_total}
-💯 Taxa de acerto: {(old_acertos / old_total) * 100:.1f}%
-🏆 Maior sequência de greens: {old_max_greens}
-🏆 Maior sequência de reds: {old_max_reds}
-
-O placar será reiniciado para uma nova contagem.
-"""
+                # Guarda os valores antigos para registro antes de zerar os contadores
+                mensagem_reinicio = REINICIO_TEMPLATE.format_map({
+                    'acertos': acertos,
+                    'erros': erros,
+                    'total': total,
+                    'taxa': (acertos / total) * 100,
+                    'max_greens': max_greens_seguidos,
+                    'max_reds': max_reds_seguidos,
+                })
                 try:
-                    for canal_id in canal_ids:
+                    # Envia mensagem sobre o reinício do placar
+                    for canal_id in canais_para_envio():
                         try:
-                            bot.send_message(canal_id, mensagem_reinicio, parse_mode='Markdown')
-                            logger.info(f"Mensagem de reinício de placar enviada para o canal {canal_id}")
+                            bot.send_message(canal_id, mensagem_reinicio, parse_mode='Markdown', disable_notification=True)
+                            logger.info("Mensagem de reinício de placar enviada para o canal %s", canal_id)
                             break
                         except Exception as e:
-                            logger.error(f"Erro ao enviar mensagem de reinício para o canal {canal_id}: {e}")
-                            
-                    # Reinicia os contadores sem interromper os palpites
-                    # Guardar valores antigos para registro do placar
-                    old_acertos = acertos
-                    old_erros = erros
-                    old_total = total
-                    old_max_greens = max_greens_seguidos
-                    old_max_reds = max_reds_seguidos
+                            logger.error("Erro ao enviar mensagem de reinício para o canal %s: %s", canal_id, e)
                     
-                    # Zera todos os contadores para iniciar novo ciclo
+                    # Zera todos os contadores para iniciar novo ciclo, sem interromper os palpites
                     acertos = 0
                     erros = 0
                     total = 0
@@ -1013,7 +1755,7 @@ O placar será reiniciado para uma nova contagem.
                     max_reds_seguidos = 0
                     logger.info("Contadores de placar reiniciados com sucesso")
                 except Exception as e:
-                    logger.error(f"Erro ao reiniciar o placar: {e}")
+                    logger.error("Erro ao reiniciar o placar: %s", e)
             
             # Obtém o palpite, contagem de gales e status defensivo
             palpite_info = gerar_palpite()
@@ -1036,16 +1778,11 @@ O placar será reiniciado para uma nova contagem.
             
             # Verifica se tem resultado atual para comparar
             if resultado_real:
-                # Determina se acertou com base no mapa de resultados corretos
-                # Garantimos que a combinação seja verificada corretamente
-                try:
-                    acertou = resultado_mapa.get(resultado_real, {}).get(palpite, False)
-                    logger.info(f"Verificando acerto: Resultado={resultado_real}, Palpite={palpite}, Acertou={acertou}")
-                except Exception as e:
-                    logger.error(f"Erro na verificação de acerto: {e}")
-                    acertou = False
+                # Determina se acertou pela tabela pré-computada (entradas desconhecidas contam como erro)
+                acertou = palpite_acertou(resultado_real, palpite)
+                logger.info("Verificando acerto: Resultado=%s, Palpite=%s, Acertou=%s", resultado_real, palpite, acertou)
                 global consecutive_errors
-                logger.info(f"Resultado real da Elephant Bet: {resultado_real}, Palpite: {palpite}, Acertou: {acertou}")
+                logger.info("Resultado real da Elephant Bet: %s, Palpite: %s, Acertou: %s", resultado_real, palpite, acertou)
                 
                 # Gerencia os contadores de acertos e erros consecutivos
                 if acertou:
@@ -1060,7 +1797,7 @@ O placar será reiniciado para uma nova contagem.
                         consecutive_errors = 0  # Reinicia contador
             else:
                 # Fallback caso não tenha resultado atual disponível (improvável)
-                acertou = random.random() > 0.25  # Mantém a taxa de 75% como fallback
+                acertou = obter_rng().random() > 0.25  # Mantém a taxa de 75% como fallback
             
             if acertou:
                 acertos += 1
@@ -1081,14 +1818,7 @@ O placar será reiniciado para uma nova contagem.
                     palpite_bonus = palpite_bonus_info
                 
                 # Mensagens de acerto variadas e mais empolgantes
-                mensagens_acerto = [
-                    "✅ ACERTAMOS! 🔥 SEQUÊNCIA DETECTADA!",
-                    "✅ GREEN CONFIRMADO! 🚀 SEQUÊNCIA QUENTE!",
-                    "✅ ACERTAMOS NOVAMENTE! 💰 PADRÃO IDENTIFICADO!",
-                    "✅ GREEN GARANTIDO! 🤑 LUCRO NA CONTA!",
-                    "✅ ACERTAMOS! 💎 ESTRATÉGIA FUNCIONANDO PERFEITAMENTE!"
-                ]
-                status = random.choice(mensagens_acerto)
+                status = obter_rng().choice(MSGS_ACERTO)
                 
                 # Mensagem mais direta para acertos
                 mensagem_adicional = f"""
@@ -1115,46 +1845,21 @@ O placar será reiniciado para uma nova contagem.
 ⚠️ NOVA ESTRATÉGIA ATIVADA!"""
                     # Mudamos a estratégia ao invés de entrar em modo defensivo
                     global PADRAO_ATUAL
-                    if PADRAO_ATUAL == "COMBINAÇÃO":
-                        PADRAO_ATUAL = "ALTERNADO"
-                    elif PADRAO_ATUAL == "ALTERNADO":
-                        PADRAO_ATUAL = "REPETIDO"
-                    else:
-                        PADRAO_ATUAL = "COMBINAÇÃO"
+                    PADRAO_ATUAL = Padrao((PADRAO_ATUAL + 1) % len(Padrao))
                     
-                    logger.info(f"Alterando padrão para: {PADRAO_ATUAL}")
+                    logger.info("Alterando padrão para: %s", PADRAO_ATUAL.name)
                     
                     # Não ativamos o modo defensivo
                     contagem_gales = 0  # Reseta o contador
                 else:
                     # Mensagens de consolo quando erra, alternando aleatoriamente
-                    mensagens_erro = [
-                        f"❌ Erramos - A mesa está difícil hoje! 😤",
-                        f"❌ Erramos - Esta mesa está manipulada! 😠",
-                        f"❌ Erramos - Não desanime, vamos recuperar! 💪",
-                        f"❌ Erramos - Mesa bagunçando o padrão! 🤬",
-                        f"❌ Erramos - Alterando a estratégia! 🔄"
-                    ]
-                    status = random.choice(mensagens_erro)
-                    
-                    # Aumentamos o contador de gales
-                    contagem_gales += 1
+                    # (o contador de gales já foi incrementado acima)
+                    status = obter_rng().choice(MSGS_ERRO)
                 
                 # Adiciona mensagem adicional consoladora
-                mensagens_adicional = [
-                    "Não desista, o próximo GREEN vem forte! 💪",
-                    "Sabemos o jogo deles, vamos dar a volta! 🔄",
-                    "A mesa está tentando nos enganar! 👀",
-                    "Mantenha o controle emocional! 🧘‍♂️", 
-                    "Nossa estratégia é superior, confia! 💯"
-                ]
-                mensagem_adicional = f"\n{random.choice(mensagens_adicional)}"
-
-            # Taxa inicial de 50% que aumenta conforme os acertos
-            taxa_base = 50.0
-            # Bônus de taxa baseado nos acertos consecutivos (greens_seguidos)
-            bonus_taxa = min(greens_seguidos * 2, 49.0)  # Limite máximo de 49% de bônus
-            taxa = taxa_base + bonus_taxa
+                mensagem_adicional = f"\n{obter_rng().choice(MSGS_ADICIONAL)}"
+
+            taxa = calcular_taxa(greens_seguidos)
             
             # Indicador de modo defensivo para mensagens
             modo_indicador = "🛡️ MODO DEFENSIVO ATIVADO!" if modo_defensivo else ""
@@ -1169,87 +1874,50 @@ Próxima: {palpite}
 
 {modo_indicador}
 Acertos: {acertos} | Erros: {erros} | Taxa: {taxa:.1f}%
+
+⏳ Próximo palpite em ~{INTERVALO_PALPITES}s
 """
             
-            # Tenta cada ID de canal - agora com IDs atualizados
+            # Tenta o canal que já funcionou ou, na primeira vez, cada ID candidato
             success = False
-            canal_ids = [-1002510265632, 1002510265632, '@bacboprediction1']  # ID atualizado diretamente aqui
-            for canal_id in canal_ids:
-                if success:
-                    break
-                    
+            for canal_id in canais_para_envio():
+                logger.info("Tentando enviar mensagem para o canal ID: %s", canal_id)
                 try:
-                    logger.info(f"Tentando enviar mensagem para o canal ID: {canal_id}")
-                    
-                    # Cria um teclado inline com botões de reação e link
-                    markup = telebot.types.InlineKeyboardMarkup(row_width=4)
-                    
-                    # Adiciona os botões com emojis na primeira linha
-                    emoji_buttons = []
-                    for key, emoji in list(REACTION_EMOJIS.items())[:4]:  # Limita a 4 emojis para o canal
-                        callback_data = f"reaction_{key}"
-                        emoji_buttons.append(telebot.types.InlineKeyboardButton(emoji, callback_data=callback_data))
-                    
-                    # Adiciona o botão de link na segunda linha
-                    link_button = telebot.types.InlineKeyboardButton(
-                        text="🎮 JOGA AGORA! 🎯🔥💰",
-                        url="https://elephant.bet"  # substitui pelo teu link de afiliado se tiver
-                    )
-                    
-                    markup.add(*emoji_buttons)  # Primeira linha com emojis
-                    markup.add(link_button)  # Segunda linha com link
-                    
                     # Envia a mensagem com os botões, sem parse_mode para evitar erros de formatação
-                    sent_msg = bot.send_message(canal_id, mensagem, reply_markup=markup, parse_mode=None)
-                    logger.info(f"Palpite enviado com sucesso para o canal {canal_id}: {palpite}")
+                    enviar_previsao(canal_id, mensagem, palpite, CHANNEL_MARKUP, disable_notification=True)
                     success = True
+                except ApiTelegramException as e:
+                    logger.error("Erro ao enviar para o canal %s: %s", canal_id, e)
                     
-                    # Armazena a mensagem no dicionário para acompanhar as reações
-                    prediction_messages[sent_msg.message_id] = {
-                        "prediction": palpite,
-                        "reactions": {emoji: 0 for emoji in REACTION_EMOJIS.values()}
-                    }
-                    
-                    # Salva este canal para tentativas futuras
-                    canal_ids = [canal_id]  # Usa apenas este daqui para frente
-                    
-                except Exception as e:
-                    erro_str = str(e)
-                    logger.error(f"Erro ao enviar para o canal {canal_id}: {e}")
-                    
-                    # Verifica se é erro de limite da API e extrai o tempo de espera
-                    if "Too Many Requests: retry after" in erro_str:
+                    # Verifica se é erro de limite da API e lê o tempo de espera estruturado
+                    tempo_espera = obter_retry_after(e)
+                    if tempo_espera is not None:
+                        logger.info("Limite da API atingido. Esperando %s segundos...", tempo_espera)
+                        # Espera o tempo indicado + 2 segundos para garantir
+                        if bot_monitor.stop_event.wait(tempo_espera + 2):
+                            return
+                        
+                        # Tenta novamente com o mesmo canal após esperar
                         try:
-                            # Extrai o número de segundos para esperar
-                            tempo_espera = int(erro_str.split("retry after ")[1])
-                            logger.info(f"Limite da API atingido. Esperando {tempo_espera} segundos...")
-                            # Espera o tempo indicado + 2 segundos para garantir
-                            time.sleep(tempo_espera + 2)
-                            
-                            # Tenta novamente com o mesmo canal após esperar
-                            try:
-                                logger.info(f"Tentando novamente enviar para o canal {canal_id} após esperar")
-                                sent_msg = bot.send_message(canal_id, mensagem, reply_markup=markup)
-                                logger.info(f"Palpite enviado com sucesso para o canal {canal_id} após esperar: {palpite}")
-                                success = True
-                                
-                                # Armazena a mensagem no dicionário para acompanhar as reações
-                                prediction_messages[sent_msg.message_id] = {
-                                    "prediction": palpite,
-                                    "reactions": {emoji: 0 for emoji in REACTION_EMOJIS.values()}
-                                }
-                                
-                                # Usa apenas este canal para frente
-                                canal_ids = [canal_id]
-                                
-                            except Exception as retry_err:
-                                logger.error(f"Erro ao retentar envio para {canal_id}: {retry_err}")
-                        except Exception as parse_err:
-                            logger.error(f"Erro ao extrair tempo de espera: {parse_err}")
+                            logger.info("Tentando novamente enviar para o canal %s após esperar", canal_id)
+                            enviar_previsao(canal_id, mensagem, palpite, CHANNEL_MARKUP, disable_notification=True)
+                            success = True
+                        except Exception as retry_err:
+                            logger.error("Erro ao retentar envio para %s: %s", canal_id, retry_err)
+                except Exception as e:
+                    logger.error("Erro ao enviar para o canal %s: %s", canal_id, e)
+                
+                if success:
+                    logger.info("Palpite enviado com sucesso para o canal %s: %s", canal_id, palpite)
+                    # Salva este canal para tentativas futuras
+                    definir_canal_funcional(canal_id)  # Usa apenas este daqui para frente
+                    break
             
             # Se não conseguiu enviar para o canal, tenta enviar diretamente para o usuário
             if not success:
                 logger.error("Não foi possível enviar para nenhum canal. Tentando enviar diretamente para o usuário.")
+                # O canal salvo deixou de funcionar: no próximo ciclo tenta todos novamente
+                definir_canal_funcional(None)
                 
                 # Se temos um usuário registrado, envia para ele
                 if PRIMEIRO_USUARIO_ID is not None:
@@ -1266,68 +1934,27 @@ Acertos: {acertos} | Erros: {erros} | Taxa: {taxa:.1f}%
 
 ⚠️ Verifique permissões do bot no canal.
 """
-                        # Cria o teclado inline com botões de reação
-                        markup = telebot.types.InlineKeyboardMarkup(row_width=4)
-                        
-                        # Adiciona os botões com emojis
-                        emoji_buttons = []
-                        for key, emoji in REACTION_EMOJIS.items():
-                            callback_data = f"reaction_{key}"
-                            emoji_buttons.append(telebot.types.InlineKeyboardButton(emoji, callback_data=callback_data))
-                        
-                        # Organiza os botões em duas linhas
-                        markup.add(*emoji_buttons[:4])  # Primeira linha com 4 emojis
-                        markup.add(*emoji_buttons[4:])  # Segunda linha com o restante
-                        
                         # Envia a mensagem com os botões de reação
-                        sent_msg = bot.send_message(PRIMEIRO_USUARIO_ID, mensagem_usuario, parse_mode="Markdown", reply_markup=markup)
-                        logger.info(f"Palpite enviado diretamente para o usuário {PRIMEIRO_USUARIO_ID}: {palpite}")
-                        
-                        # Armazena a mensagem no dicionário para acompanhar as reações
-                        prediction_messages[sent_msg.message_id] = {
-                            "prediction": palpite,
-                            "reactions": {emoji: 0 for emoji in REACTION_EMOJIS.values()}
-                        }
+                        enviar_previsao(PRIMEIRO_USUARIO_ID, mensagem_usuario, palpite, DM_MARKUP, parse_mode="Markdown",
+                                        disable_notification=True)
+                        logger.info("Palpite enviado diretamente para o usuário %s: %s", PRIMEIRO_USUARIO_ID, palpite)
                     except Exception as e:
-                        logger.error(f"Erro ao enviar mensagem direta para o usuário: {e}")
+                        logger.error("Erro ao enviar mensagem direta para o usuário: %s", e)
                 else:
                     logger.error("Nenhum usuário registrado para envio direto")
                 
-            # Mensagem temporária informando sobre o próximo palpite
-            try:
-                mensagem_espera = f"""
-{CANAL_TITULO}
-
-⏳ ANALISANDO PRÓXIMO PALPITE... ⏳
-
-⚡ Taxa fixa: 50% de assertividade
-🤖 Algoritmo inteligente ativado
-🎲 Próximo palpite em instantes...
-
-"""
-                temp_msg = bot.send_message(canal_id, mensagem_espera, parse_mode=None)
-                logger.info(f"Mensagem temporária enviada para o canal {canal_id}")
-                
-                # Intervalo de 25 segundos entre os palpites conforme solicitação atualizada
-                time.sleep(20)  # Aguarda 20 segundos e depois apaga a mensagem temporária
-                
-                # Apaga a mensagem temporária
-                try:
-                    bot.delete_message(canal_id, temp_msg.message_id)
-                    logger.info("Mensagem temporária removida")
-                except Exception as e:
-                    logger.error(f"Erro ao apagar mensagem temporária: {e}")
-                
-                # Mais 5 segundos antes do próximo palpite (totalizando 25 segundos)
-                time.sleep(5)
-                
-            except Exception as e:
-                logger.error(f"Erro ao enviar mensagem temporária: {e}")
-                # Fallback se não conseguir enviar mensagem temporária
-                time.sleep(25)  # Intervalo de 25 segundos conforme solicitado
+            # Ciclo concluído: zera o backoff de erros
+            falhas_seguidas = 0
+            
+            # O aviso de espera já vai no rodapé do palpite: só aguarda o intervalo
+            if bot_monitor.stop_event.wait(INTERVALO_PALPITES):
+                return
         except Exception as e:
-            logger.error(f"Erro ao enviar palpite: {e}")
-            time.sleep(30)  # Em caso de erro, espera 30 segundos antes de tentar novamente
+            logger.error("Erro ao enviar palpite: %s", e)
+            # Em caso de erro, espera com backoff exponencial (até 60s) antes de tentar novamente
+            falhas_seguidas += 1
+            if bot_monitor.stop_event.wait(min(60, 2 ** falhas_seguidas)):
+                return
 
 # Comando /start
 @bot.message_handler(commands=['start'])
@@ -1363,13 +1990,14 @@ Se o bot não estiver conseguindo enviar mensagens para o canal, você receberá
 
 🔔 Fique ligado nos nossos palpites!
 """
-    # Uso de try/except para garantir que erros de formatação não derrubem o bot
+    # Uso de try/except para garantir que erros de envio não derrubem o bot.
+    # Texto puro: a mensagem não tem formatação e o nome de usuário pode ter "_"
     try:
-        bot.send_message(user_id, welcome_msg, parse_mode='Markdown')
+        bot.send_message(user_id, welcome_msg)
         
         # Iniciando o envio de palpites automaticamente quando o usuário manda /start
-        # Thread para não bloquear o processamento principal
-        threading.Thread(target=lambda: gerar_e_enviar_palpite(user_id)).start()
+        # Executa no pool compartilhado para não bloquear o processamento principal
+        NOTIFY_POOL.submit(gerar_e_enviar_palpite, user_id)
         logger.info(f"Iniciando envio de palpites automáticos para o usuário {user_id}")
         
     except Exception as e:
@@ -1377,17 +2005,8 @@ Se o bot não estiver conseguindo enviar mensagens para o canal, você receberá
         # Tenta enviar sem formatação em caso de falha
         bot.send_message(user_id, "Bem-vindo ao KJ_BACBOT! Digite /help para ver os comandos disponíveis.")
 
-# Função para gerar e enviar palpites quando o usuário envia /start
-def gerar_e_enviar_palpite(user_id):
-    try:
-        # Envia um palpite inicial
-        palpite = estrategia_alta_assertividade()
-        if isinstance(palpite, tuple):
-            palpite_str = palpite[0]
-        else:
-            palpite_str = palpite
-            
-        mensagem_inicial = f"""
+# Partes fixas das mensagens do palpite inicial, montadas uma única vez
+MENSAGEM_GERANDO_PALPITE = f"""
 {CANAL_TITULO}
 
 🎲 GERANDO PALPITE... 🎲
@@ -1395,36 +2014,82 @@ def gerar_e_enviar_palpite(user_id):
 ⏳ Analisando padrões, aguarde...
 🔄 Sincronizando com a Elephant Bet...
 """
-        bot.send_message(user_id, mensagem_inicial)
-        time.sleep(3)  # Pequeno delay para simular processamento
-        
-        # Envia o palpite
-        mensagem_palpite = f"""
+
+PALPITE_CABECALHO = f"""
 {CANAL_TITULO}
 
 ✅ PALPITE GERADO COM SUCESSO!
 
-🎯 Recomendação: {palpite_str}
+🎯 Recomendação: """
+
+PALPITE_RODAPE = """
 ⚡ Taxa fixa: 50% de assertividade
 🔮 Algoritmo inteligente ativado
 
 ⚠️ Próximo palpite em 25 segundos
 """
-        # Cria o teclado inline com botão para jogar
-        markup = telebot.types.InlineKeyboardMarkup()
-        link_button = telebot.types.InlineKeyboardButton(
-            text="🎮 JOGA AGORA! 🎯🔥💰",
-            url="https://elephant.bet"
-        )
-        markup.add(link_button)
+
+# Função para gerar e enviar palpites quando o usuário envia /start
+# Atraso entre o aviso "GERANDO PALPITE" e o palpite em si (segundos)
+ATRASO_PALPITE_INICIAL = 3.0
+
+def gerar_e_enviar_palpite(user_id):
+    """
+    Envia o aviso de geração do palpite e agenda o envio do palpite num Timer,
+    liberando a thread do pool imediatamente em vez de dormir 3 segundos.
+
+    Args:
+        user_id: ID do usuário que receberá o palpite
+    """
+    try:
+        # Envia um palpite inicial
+        palpite = estrategia_alta_assertividade()
+        if isinstance(palpite, tuple):
+            palpite_str = palpite[0]
+        else:
+            palpite_str = palpite
+            
+        bot.send_message(user_id, MENSAGEM_GERANDO_PALPITE, disable_notification=True)
+        # Pequeno delay para simular processamento, sem bloquear a thread
+        timer = threading.Timer(ATRASO_PALPITE_INICIAL, enviar_palpite_inicial, args=(user_id, palpite_str))
+        timer.daemon = True
+        timer.start()
         
-        bot.send_message(user_id, mensagem_palpite, reply_markup=markup)
+    except Exception as e:
+        logger.error(f"Erro ao enviar palpite inicial após /start: {e}")
+        bot.send_message(user_id, "Erro ao gerar palpite. Por favor, tente novamente mais tarde.")
+
+def enviar_palpite_inicial(user_id, palpite_str):
+    """
+    Segunda fase do /start: envia o palpite gerado em gerar_e_enviar_palpite.
+
+    Args:
+        user_id: ID do usuário que receberá o palpite
+        palpite_str: Recomendação já calculada
+    """
+    try:
+        # Envia o palpite: apenas a recomendação muda entre as mensagens
+        mensagem_palpite = PALPITE_CABECALHO + palpite_str + PALPITE_RODAPE
+        bot.send_message(user_id, mensagem_palpite, reply_markup=JOGAR_MARKUP, disable_notification=True)
         logger.info(f"Palpite inicial enviado para o usuário {user_id}: {palpite_str}")
         
     except Exception as e:
         logger.error(f"Erro ao enviar palpite inicial após /start: {e}")
         bot.send_message(user_id, "Erro ao gerar palpite. Por favor, tente novamente mais tarde.")
 
+# Processo do bot para as estatísticas de recursos. A criação já inicia a medição
+# de CPU, então cpu_percent(interval=None) devolve o uso desde a chamada anterior
+# sem bloquear o handler
+if HAS_PSUTIL:
+    PROCESSO = psutil.Process()
+    PROCESSO.cpu_percent(interval=None)
+else:
+    PROCESSO = None
+
+# Resultado da última verificação do token (get_me): feita na inicialização e
+# atualizada pelo monitoramento, nunca a cada comando
+TOKEN_VALIDO = False
+
 # Comando /status
 @bot.message_handler(commands=['status'])
 def status_cmd(msg):
@@ -1450,14 +2115,10 @@ def status_cmd(msg):
         max_greens_seguidos = 0
         
     if total > 0:
-        # Taxa inicial de 50% que aumenta conforme os acertos
-        taxa_base = 50.0
-        # Bônus de taxa baseado nos acertos consecutivos
-        bonus_taxa = min(greens_seguidos * 2, 49.0)  # Limite máximo de 49% de bônus
-        taxa = taxa_base + bonus_taxa
+        taxa = calcular_taxa(greens_seguidos)
 
         status_msg = f"""
-📊 *Status do KJ_BACBOT* 📊
+📊 <b>Status do KJ_BACBOT</b> 📊
 - Palpites enviados: {total}
 - Acertos: {acertos}
 - Erros: {erros}
@@ -1472,7 +2133,7 @@ def status_cmd(msg):
 - Acertos totais: {acertos}/{meta_total_acertos}
 - Acertos consecutivos: {greens_seguidos}/{meta_acertos_consecutivos}
 
-🔧 *Sistema de Monitoramento 24/7*
+🔧 <b>Sistema de Monitoramento 24/7</b>
 ⏰ Tempo online: {status_monitor['uptime']}
 🔄 Reinícios: {status_monitor['restart_count']}
 ⚡ Status: {'✅ Ativo' if status_monitor['active'] else '❌ Inativo!'}
@@ -1485,27 +2146,26 @@ O bot ainda não enviou nenhum palpite.
 - Acertos totais: 0/{meta_total_acertos}
 - Acertos consecutivos: 0/{meta_acertos_consecutivos}
 
-🔧 *Sistema de Monitoramento 24/7*
+🔧 <b>Sistema de Monitoramento 24/7</b>
 ⏰ Tempo online: {status_monitor['uptime']}
 🔄 Reinícios: {status_monitor['restart_count']}
 ⚡ Status: {'✅ Ativo' if status_monitor['active'] else '❌ Inativo!'}
 """
     
     # Adiciona informações de recursos do sistema se disponível
-    try:
-        import psutil
-        processo = psutil.Process()
-        status_msg += f"""
-💻 *Recursos do sistema:*
-- CPU: {processo.cpu_percent(interval=0.5):.1f}%
-- Memória: {processo.memory_info().rss / 1024 / 1024:.1f} MB
+    if HAS_PSUTIL:
+        try:
+            status_msg += f"""
+💻 <b>Recursos do sistema:</b>
+- CPU: {PROCESSO.cpu_percent(interval=None):.1f}%
+- Memória: {PROCESSO.memory_info().rss / 1024 / 1024:.1f} MB
 - Threads: {threading.active_count()}
 """
-    except Exception as e:
-        logger.error(f"Erro ao obter informações do sistema: {e}")
+        except Exception as e:
+            logger.error(f"Erro ao obter informações do sistema: {e}")
     
-    # Envia a mensagem com formatação Markdown
-    bot.send_message(msg.chat.id, status_msg, parse_mode="Markdown")
+    # Envia a mensagem com formatação HTML (o "_" de KJ_BACBOT quebra o Markdown)
+    bot.send_message(msg.chat.id, status_msg, parse_mode="HTML")
     
     # Registra este usuário como administrador para receber alertas
     bot_monitor.register_admin(msg.from_user.id)
@@ -1521,7 +2181,7 @@ O bot ainda não enviou nenhum palpite.
 @bot.message_handler(commands=['help'])
 def help_cmd(msg):
     help_msg = """
-🤖 *KJ_BACBOT AJUDA* 🤖
+🤖 <b>KJ_BACBOT AJUDA</b> 🤖
 
 Comandos disponíveis:
 /start - Iniciar o bot
@@ -1531,7 +2191,7 @@ Comandos disponíveis:
 /palpite - Gerar um palpite com animação
 /reactions - Ver estatísticas de reações
 
-💎 *ALGORITMO AVANÇADO DE INTELIGÊNCIA ARTIFICIAL (99%)*
+💎 <b>ALGORITMO AVANÇADO DE INTELIGÊNCIA ARTIFICIAL (99%)</b>
 Apostas estratégicas limitadas a:
 - 🟠+🔵 Laranja e Azul
 - 🟠+🔴 Laranja e Vermelho
@@ -1542,7 +2202,7 @@ Apostas estratégicas limitadas a:
 Os palpites são enviados automaticamente para o canal a cada 15 segundos, com precisão.
 Você pode reagir às previsões com emojis!
 """
-    bot.reply_to(msg, help_msg, parse_mode='Markdown')
+    bot.reply_to(msg, help_msg, parse_mode='HTML')
 
 # Comando /palpite
 @bot.message_handler(commands=['palpite'])
@@ -1552,11 +2212,12 @@ def palpite_cmd(msg):
     """
     user_id = msg.from_user.id
     
-    # Thread para não bloquear o bot durante a animação
-    def gerar_palpite_thread():
+    # Envia o resultado final após a animação (executado fora do loop de eventos)
+    def enviar_resultado(palpite):
         try:
-            # Gera o palpite com animação
-            palpite = gerar_palpite_com_animacao(user_id)
+            # A animação retorna (palpite, gales, defesa); aqui usamos apenas o palpite
+            if isinstance(palpite, tuple):
+                palpite = palpite[0]
             
             # Verificar resultado da Elephant Bet para acerto/erro real
             dados_elephant = atualizar_resultados_elephant()
@@ -1566,24 +2227,13 @@ def palpite_cmd(msg):
             if resultado_real:
                 # Determina se o palpite foi correto comparando com o resultado real
                 # Usando o mesmo método que o bot usa para validar os palpites
-                acertou = False
-                
                 # Verifica o resultado com base no mapa de resultados
-                if palpite.startswith('🟠+🔵'):  # Combinação Laranja+Azul
-                    acertou = resultado_real in ['🟠', '🔵']
-                elif palpite.startswith('🟠+🔴'):  # Combinação Laranja+Vermelho
-                    acertou = resultado_real in ['🟠', '🔴']
-                elif palpite.startswith('🟠'):  # Apenas Laranja
-                    acertou = resultado_real == '🟠'
-                elif palpite.startswith('🔵'):  # Apenas Azul
-                    acertou = resultado_real == '🔵'
-                elif palpite.startswith('🔴'):  # Apenas Vermelho
-                    acertou = resultado_real == '🔴'
+                acertou = palpite_acertou(resultado_real, palpite)
                 
                 logger.info(f"Resultado da Elephant Bet: {resultado_real}, Palpite: {palpite}, Acertou: {acertou}")
             else:
                 # Fallback se não conseguir obter o resultado da Elephant Bet
-                acertou = random.random() > 0.25  # 75% como fallback
+                acertou = obter_rng().random() > 0.25  # 75% como fallback
                 logger.warning("Usando fallback para validação de acerto/erro - resultado da Elephant Bet não disponível")
                 
             if acertou:
@@ -1606,46 +2256,32 @@ def palpite_cmd(msg):
                 
             # Envia a mensagem final formatada
             mensagem = f"""
-🎮 *KJ_BACBOT - PALPITE PERSONALIZADO* 🎮
+🎮 <b>KJ_BACBOT - PALPITE PERSONALIZADO</b> 🎮
 
 {status}
 
-📊 *Recomendação:* {palpite}
+📊 <b>Recomendação:</b> {palpite}
 {mensagem_adicional}
 
-⏰ {time.strftime('%H:%M:%S')}
+⏰ {now_hms()}
 
 🔮 Use com sabedoria!
 
 Reaja a este palpite:
 """
-            # Cria o teclado inline com emojis de reação
-            markup = telebot.types.InlineKeyboardMarkup(row_width=4)
-            
-            # Adiciona os botões com emojis
-            emoji_buttons = []
-            for key, emoji in REACTION_EMOJIS.items():
-                callback_data = f"reaction_{key}"
-                emoji_buttons.append(telebot.types.InlineKeyboardButton(emoji, callback_data=callback_data))
-            
-            # Organiza os botões em duas linhas
-            markup.add(*emoji_buttons[:4])  # Primeira linha com 4 emojis
-            markup.add(*emoji_buttons[4:])  # Segunda linha com o restante
-            
             # Envia a mensagem com os botões de reação
-            sent_msg = bot.send_message(user_id, mensagem, parse_mode='Markdown', reply_markup=markup)
-            
-            # Armazena a mensagem no dicionário para acompanhar as reações
-            prediction_messages[sent_msg.message_id] = {
-                "prediction": palpite,
-                "reactions": {emoji: 0 for emoji in REACTION_EMOJIS.values()}
-            }
+            enviar_previsao(user_id, mensagem, palpite, DM_MARKUP, parse_mode='HTML')
             
         except Exception as e:
             bot.send_message(user_id, f"Erro ao gerar palpite: {str(e)}")
     
-    # Inicia a thread para a animação
-    threading.Thread(target=gerar_palpite_thread).start()
+    async def gerar_palpite_async():
+        # Gera o palpite com animação
+        palpite = await gerar_palpite_com_animacao(user_id)
+        await asyncio.to_thread(enviar_resultado, palpite)
+    
+    # Agenda a animação no loop compartilhado em vez de criar uma thread por comando
+    asyncio.run_coroutine_threadsafe(gerar_palpite_async(), animation_loop)
 
 # Comando /test
 @bot.message_handler(commands=['test'])
@@ -1653,26 +2289,40 @@ def test_cmd(msg):
     bot.reply_to(msg, "Testando conexão com o canal... Aguarde.")
     
     user_id = msg.from_user.id
-    canal_ids = [-1002510265632, 1002510265632, '@bacboprediction1']  # IDs atualizados diretamente
     
-    # Tenta cada formato de ID
+    # Sonda todos os formatos de ID em paralelo (get_chat não publica nada no
+    # canal) e tenta enviar a cada um que responder, na ordem das respostas,
+    # até um envio funcionar; os IDs restantes ficam como alternativa
     success = False
     resultados = []
     
-    for canal_id in canal_ids:
+    futuros = {NOTIFY_POOL.submit(bot.get_chat, canal_id): canal_id for canal_id in CANAL_IDS}
+    for futuro in concurrent.futures.as_completed(futuros):
+        canal_id = futuros[futuro]
+        erro = futuro.exception()
+        if erro is not None:
+            resultados.append(f"❌ Falha ao conectar com o canal usando ID: {canal_id}\nErro: {erro}")
+            continue
+        
         try:
             mensagem_teste = f"""
 Teste de Conexão KJ_BACBOT
 Canal: {CANAL_TITULO}
 ID: {canal_id}
-Hora: {time.strftime('%H:%M:%S')}
+Hora: {now_hms()}
 """
             bot.send_message(canal_id, mensagem_teste)
-            resultados.append(f"✅ Conexão bem-sucedida com o canal usando ID: {canal_id}")
-            success = True
-            
-            # Se conseguiu com este ID, envia confirmação para o usuário e para de tentar
-            mensagem_sucesso = f"""
+        except Exception as e:
+            resultados.append(f"❌ Falha ao enviar para o canal usando ID: {canal_id}\nErro: {e}")
+            continue
+        
+        resultados.append(f"✅ Conexão bem-sucedida com o canal usando ID: {canal_id}")
+        success = True
+        # Os próximos palpites vão direto para este ID
+        definir_canal_funcional(canal_id)
+        
+        # Se conseguiu com este ID, envia confirmação para o usuário
+        mensagem_sucesso = f"""
 ✅ Conexão estabelecida com sucesso!
 
 Canal: {CANAL_TITULO}
@@ -1680,12 +2330,10 @@ ID: {canal_id}
 
 O bot está conectado ao canal e consegue enviar mensagens.
 """
-            bot.send_message(user_id, mensagem_sucesso)
-            break
-            
-        except Exception as e:
-            erro = str(e)
-            resultados.append(f"❌ Falha ao conectar com o canal usando ID: {canal_id}\nErro: {erro}")
+        bot.send_message(user_id, mensagem_sucesso)
+        break
+    for futuro in futuros:
+        futuro.cancel()
     
     if not success:
         # Se nenhum ID funcionou, envia relatório completo
@@ -1716,28 +2364,80 @@ Possíveis soluções:
     # Mostrar também o status atual do bot
     status_cmd(msg)
 
+# Janela (s) em que cliques seguidos numa mesma mensagem viram uma única edição
+REACTION_DEBOUNCE = 0.4
+
+def atualizar_reacoes_mensagem(message_id):
+    """
+    Aplica numa única edição todas as reações acumuladas na janela de debounce
+    
+    Args:
+        message_id: ID da mensagem de palpite a atualizar
+    """
+    with prediction_messages_lock:
+        entrada = prediction_messages.get(message_id)
+        if entrada is None:
+            return
+        entrada["edicao_pendente"] = False
+        reacoes = list(entrada["reactions"].items())
+        base_text = entrada["base_text"]
+        parse_mode = entrada["parse_mode"]
+        chat_id = entrada["chat_id"]
+        markup = entrada["markup"]
+    
+    # Atualiza o texto da mensagem para incluir as reações
+    reactions_text = ""
+    for e, c in reacoes:
+        if c > 0:
+            reactions_text += f"{e}: {c}  "
+    
+    # O texto original é guardado no registro: a seção de reações é sempre
+    # reconstruída a partir dele, sem procurar a seção anterior no texto atual
+    updated_text = base_text + "\n\nReações:\n" + reactions_text
+    
+    # Atualiza a mensagem com as novas reações
+    try:
+        bot.edit_message_text(
+            chat_id=chat_id,
+            message_id=message_id,
+            text=updated_text,
+            reply_markup=markup,
+            parse_mode=parse_mode
+        )
+    except Exception as e:
+        logger.error(f"Erro ao atualizar mensagem com reações: {e}")
+
 # Manipulador para reações (callback queries dos botões inline)
 @bot.callback_query_handler(func=lambda call: call.data.startswith('reaction_'))
 def handle_reaction(call):
     """
-    Processa as reações dos usuários aos palpites
+    Processa as reações dos usuários aos palpites. A contagem é imediata, mas a
+    edição da mensagem é agrupada: cliques dentro de REACTION_DEBOUNCE segundos
+    geram um único edit_message_text
     """
-    user_id = call.from_user.id
     message_id = call.message.message_id
     reaction_type = call.data.split('_')[1]  # Obtém o tipo de reação (like, love, etc.)
     
+    # Obtém o emoji correspondente ao tipo de reação
+    emoji = REACTION_EMOJIS.get(reaction_type)
+    
+    with prediction_messages_lock:
+        entrada = prediction_messages.get(message_id)
+        if entrada is not None and emoji:
+            # Incrementa a contagem dessa reação e o total geral
+            entrada["reactions"][emoji] += 1
+            count = entrada["reactions"][emoji]
+            reaction_totals[emoji] += 1
+            
+            # Guarda o estado da mensagem para a edição agrupada
+            entrada["chat_id"] = call.message.chat.id
+            entrada["markup"] = call.message.reply_markup
+            agendar_edicao = not entrada["edicao_pendente"]
+            entrada["edicao_pendente"] = True
+    
     # Verifica se a mensagem está no nosso dicionário
-    if message_id in prediction_messages:
-        # Obtém o emoji correspondente ao tipo de reação
-        emoji = REACTION_EMOJIS.get(reaction_type)
-        
+    if entrada is not None:
         if emoji:
-            # Incrementa a contagem dessa reação
-            prediction_messages[message_id]["reactions"][emoji] += 1
-            
-            # Obtém a contagem atual
-            count = prediction_messages[message_id]["reactions"][emoji]
-            
             # Responde ao usuário
             bot.answer_callback_query(
                 call.id, 
@@ -1745,52 +2445,11 @@ def handle_reaction(call):
                 show_alert=False
             )
             
-            # Atualiza o texto da mensagem para incluir as reações
-            prediction = prediction_messages[message_id]["prediction"]
-            reactions_text = ""
-            
-            for e, c in prediction_messages[message_id]["reactions"].items():
-                if c > 0:
-                    reactions_text += f"{e}: {c}  "
-            
-            # Prepara o texto atualizado da mensagem
-            current_text = call.message.text
-            
-            # Verifica se já existe uma seção de reações
-            if "Reações:" in current_text:
-                # Substitui a seção de reações existente
-                lines = current_text.split('\n')
-                new_lines = []
-                reactions_section = False
-                
-                for line in lines:
-                    if line.strip() == "Reações:":
-                        reactions_section = True
-                        new_lines.append("Reações:")
-                        new_lines.append(reactions_text)
-                    elif reactions_section and any(emoji in line for emoji in REACTION_EMOJIS.values()):
-                        # Pula as linhas de reações anteriores
-                        continue
-                    else:
-                        reactions_section = False
-                        new_lines.append(line)
-                
-                updated_text = '\n'.join(new_lines)
-            else:
-                # Adiciona a seção de reações ao final
-                updated_text = current_text + f"\n\nReações:\n{reactions_text}"
-            
-            # Atualiza a mensagem com as novas reações
-            try:
-                bot.edit_message_text(
-                    chat_id=call.message.chat.id,
-                    message_id=message_id,
-                    text=updated_text,
-                    reply_markup=call.message.reply_markup,
-                    parse_mode='Markdown'
-                )
-            except Exception as e:
-                logger.error(f"Erro ao atualizar mensagem com reações: {e}")
+            # Apenas o primeiro clique da janela agenda a edição
+            if agendar_edicao:
+                timer = threading.Timer(REACTION_DEBOUNCE, atualizar_reacoes_mensagem, args=(message_id,))
+                timer.daemon = True
+                timer.start()
     else:
         # Mensagem não encontrada no dicionário
         bot.answer_callback_query(
@@ -1832,25 +2491,24 @@ def monitor_cmd(msg):
 """
     
     # Adiciona informações de sistema
-    import psutil
-    try:
-        process = psutil.Process()
-        memoria = process.memory_info().rss / 1024 / 1024  # MB
-        cpu = process.cpu_percent(interval=0.5)
-        monitor_stats += f"""
+    if HAS_PSUTIL:
+        try:
+            memoria = PROCESSO.memory_info().rss / 1024 / 1024  # MB
+            cpu = PROCESSO.cpu_percent(interval=None)
+            monitor_stats += f"""
 💻 *Recursos do sistema:*
 - CPU: {cpu:.1f}%
 - Memória: {memoria:.1f} MB
 - Threads: {threading.active_count()}
 """
-    except:
-        # Se não conseguir obter informações do sistema, ignora
-        pass
+        except:
+            # Se não conseguir obter informações do sistema, ignora
+            pass
     
     # Adiciona informações sobre conexão com Telegram
     monitor_stats += f"""
 🤖 *Conexão Telegram:*
-- Token válido: {'Sim' if bot.get_me() else 'Não'}
+- Token válido: {'Sim' if TOKEN_VALIDO else 'Não'}
 - Canal Principal: {CANAL_ID}
 - Notificações de erro: {'✅ Configuradas' if bot_monitor.admin_chat_ids else '❌ Não configuradas'}
 - Meta de acertos totais: {acertos}/{meta_total_acertos}
@@ -1889,22 +2547,15 @@ def reactions_cmd(msg):
         bot.send_message(user_id, "Ainda não há palpites com reações.")
         return
     
-    # Conta todas as reações
-    all_reactions = {}
-    for msg_id, data in prediction_messages.items():
-        for emoji, count in data["reactions"].items():
-            if emoji not in all_reactions:
-                all_reactions[emoji] = 0
-            all_reactions[emoji] += count
+    # Totais acumulados de todas as reações (mantidos a cada clique)
+    with prediction_messages_lock:
+        sorted_reactions = reaction_totals.most_common()
     
     # Se não houver reações
-    if not all_reactions or sum(all_reactions.values()) == 0:
+    if not sorted_reactions:
         bot.send_message(user_id, "Ainda não há reações aos palpites.")
         return
     
-    # Ordena as reações pela contagem (mais populares primeiro)
-    sorted_reactions = sorted(all_reactions.items(), key=lambda x: x[1], reverse=True)
-    
     # Cria a mensagem com estatísticas
     reactions_stats = "📊 *Estatísticas de Reações*\n\n"
     
@@ -1914,17 +2565,195 @@ def reactions_cmd(msg):
     
     bot.send_message(user_id, reactions_stats, parse_mode='Markdown')
 
+# Parâmetros do polling: o Telegram segura o getUpdates por até LONG_POLLING_TIMEOUT
+# segundos (50 é o máximo aceito pelo servidor) e responde assim que chega uma
+# atualização. POLLING_TIMEOUT é o limite do HTTP e precisa ser maior que ele
+POLLING_TIMEOUT = 75
+LONG_POLLING_TIMEOUT = 50
+
+# Reação do loop de polling a cada tipo de erro: nível e texto do log, atraso
+# fixo (None para crescer a partir do atual), fator de crescimento, limite do
+# atraso e se o erro é terminal (encerra sem esperar nem testar a conexão)
+AcaoPolling = collections.namedtuple(
+    'AcaoPolling',
+    ['nivel', 'mensagem', 'atraso_fixo', 'fator', 'limite', 'terminal']
+)
+
+# Erros da API identificados pelo error_code estruturado da resposta
+ACOES_POLLING = {
+    429: AcaoPolling(logging.WARNING, "Limite de requisições Telegram excedido. Aguardando mais tempo: %s", None, 2, 60, False),
+    401: AcaoPolling(logging.CRITICAL, "Token do bot inválido ou revogado. Encerrando: %s", None, 1, 0, True),
+    409: AcaoPolling(logging.WARNING, "Outro polling já está em execução. Reiniciando: %s", 10, 1, 10, False),
+}
+# Falhas de rede tratadas com backoff de conexão (SSLError e ConnectTimeout já
+# são subclasses de ConnectionError)
+ERROS_CONEXAO = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ReadTimeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+ACAO_POLLING_CONEXAO = AcaoPolling(logging.ERROR, "Erro de conexão com a API do Telegram: %s", None, 1.5, 30, False)
+ACAO_POLLING_GENERICA = AcaoPolling(logging.ERROR, "Erro não categorizado: %s", None, 1, 300, False)
+
+def rede_disponivel():
+    """
+    Testa se api.telegram.org aceita conexões TCP, sem gastar uma chamada da
+    API (que conta nos limites de taxa, inclusive durante um 429)
+    
+    Returns:
+        bool: True se a conexão na porta 443 foi estabelecida
+    """
+    try:
+        socket.create_connection(("api.telegram.org", 443), timeout=3).close()
+        return True
+    except OSError:
+        return False
+
+def classificar_erro_polling(erro):
+    """
+    Decide como o loop de polling deve reagir a um erro
+    
+    Args:
+        erro: Exceção lançada pelo polling
+    
+    Returns:
+        AcaoPolling: Ação correspondente ao tipo de erro
+    """
+    if isinstance(erro, ApiTelegramException):
+        acao = ACOES_POLLING.get(erro.error_code)
+        if acao is not None:
+            return acao
+    if isinstance(erro, ERROS_CONEXAO):
+        return ACAO_POLLING_CONEXAO
+    return ACAO_POLLING_GENERICA
+
+class RegistroErroPolling(telebot.ExceptionHandler):
+    """
+    Guarda o último erro da API no getUpdates. Com non_stop=False a biblioteca
+    trata esses erros (429, 409, 401, 5xx) encerrando o polling sem lançá-los,
+    então o loop de main() recupera o erro daqui para classificá-lo
+    """
+    def __init__(self):
+        self.ultimo_erro = None
+
+    def handle(self, exception):
+        if getattr(exception, 'function_name', None) == 'getUpdates':
+            self.ultimo_erro = exception
+        return False  # Não tratado: mantém o comportamento padrão da biblioteca
+
+registro_erros_polling = RegistroErroPolling()
+bot.exception_handler = registro_erros_polling
+
+# Administradores avisados quando o processo principal falha
+ADMIN_IDS = (6515136130,)  # Use o ID do seu admin aqui
+
+# Aviso de falha crítica enviado a cada tentativa de reinício
+ERRO_CRITICO_TEMPLATE = "🚨 *ERRO CRÍTICO* 🚨\n\nO bot sofreu uma falha: `{erro}`\n\nTentativa de reinício automático: {tentativa}/{maximo}"
+
+async def notificar_admins(texto, parse_mode="Markdown"):
+    """
+    Envia a mesma mensagem a todos os administradores em paralelo: o tempo total
+    é o do envio mais lento, não a soma de todos
+    
+    Args:
+        texto: Texto da notificação
+        parse_mode: Modo de formatação do texto
+    """
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(
+        loop.run_in_executor(NOTIFY_POOL, enviar_notificacao_segura, admin_id, texto, parse_mode)
+        for admin_id in list(bot_monitor.admin_chat_ids)
+    ))
+
+async def monitorar_bot():
+    """Monitoramento contínuo do bot, executado como corrotina no animation_loop"""
+    global TOKEN_VALIDO
+    logger.info("Iniciando monitoramento 24/7")
+    
+    while bot_monitor.running:
+        try:
+            # Verifica a atividade do bot
+            if not bot_monitor.check_activity():
+                logger.warning(f"Bot inativo por mais de {bot_monitor.max_silence} segundos. Verificando...")
+                
+                # Tenta enviar uma mensagem de ping para verificar se o bot está funcionando
+                try:
+                    await asyncio.to_thread(bot.get_me)
+                    TOKEN_VALIDO = True
+                    logger.info("Bot ainda está conectado ao Telegram, mas inativo")
+                    
+                    # Registra atividade para evitar múltiplas notificações
+                    bot_monitor.register_activity()
+                    
+                    # Notifica administradores
+                    await notificar_admins(
+                        "⚠️ *ALERTA DE MONITORAMENTO* ⚠️\n\nBot está conectado mas inativo. Verificando sistemas..."
+                    )
+                except Exception as e:
+                    TOKEN_VALIDO = False
+                    logger.error(f"Erro na conexão com a API do Telegram: {e}")
+                    
+                    # Verifica se pode reiniciar
+                    if bot_monitor.can_restart():
+                        # O polling reconecta sozinho quando a API volta: parar e
+                        # reiniciar o polling aqui só perderia atualizações
+                        logger.warning("Conexão perdida; o polling reconectará automaticamente")
+                        bot_monitor.register_restart()
+                        
+                        # Notifica todos administradores sobre a reconexão
+                        await notificar_admins(
+                            "🔄 *RECONEXÃO AUTOMÁTICA* 🔄\n\nConexão com o Telegram perdida por inatividade. O bot reconectará automaticamente."
+                        )
+                    else:
+                        logger.error("Limite de reinicializações atingido. Esperando intervenção manual.")
+            
+            # Espera um pouco antes da próxima verificação
+            await asyncio.sleep(15)
+        except Exception as e:
+            logger.error(f"Erro no monitoramento: {e}")
+            await asyncio.sleep(30)  # Espera mais tempo em caso de erro
+
+# Pedido de reinício feito pelo administrador: o handler apenas sinaliza e para
+# o polling; o reinício em si é feito pela thread principal, em main()
+reinicio_solicitado = threading.Event()
+
+def reiniciar_processo():
+    """
+    Reinicia o bot num interpretador novo (os.execv), sem threads, conexões ou
+    estado herdados do processo atual. Os logs pendentes são gravados logo antes
+    do exec; se ele falhar, o listener de logs volta a funcionar e o erro é propagado
+    
+    Raises:
+        OSError: Se o os.execv falhar (o processo atual continua rodando)
+    """
+    logger.warning("Reiniciando o processo do bot...")
+    with log_listener_lock:
+        log_listener.stop()
+        file_buffer.flush()
+        try:
+            os.execv(sys.executable, [sys.executable] + sys.argv)
+        except OSError:
+            log_listener.start()
+            raise
+
 def main():
+    global TOKEN_VALIDO
     logger.info("Bot iniciado!")
     
+    # Verifica o token uma única vez na inicialização
+    try:
+        bot.get_me()
+        TOKEN_VALIDO = True
+    except Exception as e:
+        logger.error(f"Não foi possível validar o token do bot: {e}")
+    
     # Tenta enviar mensagem inicial para o canal usando a função resiliente
     try:
-        canal_ids = [CANAL_ID, CANAL_ID_ALT, '@bacboprediction1']
         mensagem_inicio = f"""
-🚀 *KJ_BACBOT INICIADO* 🚀
+🚀 <b>KJ_BACBOT INICIADO</b> 🚀
 
 ✅ Bot iniciado com sucesso!
-⏰ Horário: {time.strftime('%H:%M:%S')}
+⏰ Horário: {now_hms()}
 📊 Intervalo entre palpites: 15 segundos
 📈 Placar será exibido a cada 10 minutos
 📱 Assertividade: 99%
@@ -1938,9 +2767,9 @@ def main():
 """
         # Usa a função resiliente para enviar a mensagem
         sent_msg, success = enviar_mensagem_resiliente(
-            chat_ids=canal_ids,
+            chat_ids=CANAL_IDS,
             texto=mensagem_inicio,
-            parse_mode='Markdown',
+            parse_mode='HTML',
             retry_count=5  # Aumentamos o número de tentativas para a mensagem inicial
         )
         if not success:
@@ -1966,87 +2795,13 @@ def main():
     else:
         logger.warning("Sistema de mensagens programadas não disponível")
     
-    # Inicia a thread de monitoramento 24/7
-    def monitor_thread_func():
-        """Thread para monitoramento contínuo do bot"""
-        logger.info("Iniciando thread de monitoramento 24/7")
-        
-        while bot_monitor.running:
-            try:
-                # Verifica a atividade do bot
-                if not bot_monitor.check_activity():
-                    logger.warning(f"Bot inativo por mais de {bot_monitor.max_silence} segundos. Verificando...")
-                    
-                    # Tenta enviar uma mensagem de ping para verificar se o bot está funcionando
-                    try:
-                        bot.get_me()
-                        logger.info("Bot ainda está conectado ao Telegram, mas inativo")
-                        
-                        # Registra atividade para evitar múltiplas notificações
-                        bot_monitor.register_activity()
-                        
-                        # Notifica administradores
-                        for admin_id in bot_monitor.admin_chat_ids:
-                            try:
-                                bot.send_message(
-                                    admin_id, 
-                                    "⚠️ *ALERTA DE MONITORAMENTO* ⚠️\n\nBot está conectado mas inativo. Verificando sistemas...",
-                                    parse_mode="Markdown"
-                                )
-                            except Exception as e:
-                                logger.error(f"Não foi possível notificar administrador {admin_id}: {e}")
-                    except Exception as e:
-                        logger.error(f"Erro na conexão com a API do Telegram: {e}")
-                        
-                        # Verifica se pode reiniciar
-                        if bot_monitor.can_restart():
-                            logger.warning("Tentando reiniciar o bot...")
-                            bot_monitor.register_restart()
-                            
-                            # Notifica todos administradores sobre a reinicialização
-                            for admin_id in bot_monitor.admin_chat_ids:
-                                try:
-                                    bot.send_message(
-                                        admin_id,
-                                        "🔄 *REINÍCIO AUTOMÁTICO* 🔄\n\nO bot será reiniciado devido a inatividade detectada.",
-                                        parse_mode="Markdown"
-                                    )
-                                except:
-                                    # Ignora erros de envio - o bot pode estar com problemas
-                                    pass
-                            
-                            # Aqui poderia ter um código para reiniciar o processo
-                            # Em um ambiente mais avançado, isso seria feito com um watchdog externo
-                            # Para um efeito similar, vamos forçar uma reconexão
-                            try:
-                                bot.stop_polling()
-                                time.sleep(5)
-                                bot.polling(none_stop=True, timeout=60)
-                                logger.info("Bot reiniciado com sucesso!")
-                            except Exception as e:
-                                logger.error(f"Falha ao reiniciar o bot: {e}")
-                                bot_monitor.report_error(str(e))
-                        else:
-                            logger.error("Limite de reinicializações atingido. Esperando intervenção manual.")
-                
-                # Processa a fila de erros
-                bot_monitor.process_errors()
-                
-                # Espera um pouco antes da próxima verificação
-                time.sleep(15)
-            except Exception as e:
-                logger.error(f"Erro na thread de monitoramento: {e}")
-                time.sleep(30)  # Espera mais tempo em caso de erro
-    
     # Inicia a thread de palpites
     prediction_thread = threading.Thread(target=enviar_palpite, name="PredictionThread")
     prediction_thread.daemon = True
     prediction_thread.start()
     
-    # Inicia a thread de monitoramento
-    monitor_thread = threading.Thread(target=monitor_thread_func, name="MonitorThread")
-    monitor_thread.daemon = True
-    monitor_thread.start()
+    # Inicia o monitoramento 24/7 no loop de eventos compartilhado
+    asyncio.run_coroutine_threadsafe(monitorar_bot(), animation_loop)
     
     # Thread para processamento de comandos de administração
     @bot.callback_query_handler(func=lambda call: call.data.startswith('admin_'))
@@ -2063,27 +2818,27 @@ def main():
         if action == "restart":
             # Reinicia o bot
             bot.answer_callback_query(call.id, "Reiniciando o bot...", show_alert=True)
-            bot.send_message(user_id, "🔄 Reiniciando o bot, por favor aguarde...")
+            bot.send_message(user_id, "🔄 Reiniciando o bot, por favor aguarde (até 1 minuto)...")
             
             # Registra o reinício
             bot_monitor.register_restart()
             
-            # Reinicia a conexão com o Telegram
-            try:
-                bot.stop_polling()
-                time.sleep(3)
-                bot.polling(none_stop=True)
-                bot.send_message(user_id, "✅ Bot reiniciado com sucesso!")
-            except Exception as e:
-                bot.send_message(user_id, f"❌ Erro ao reiniciar: {str(e)}")
-                logger.error(f"Erro ao reiniciar via comando de administrador: {e}")
+            # O processo não é reiniciado aqui, numa thread de handler: o polling é
+            # parado e main() confirma as atualizações recebidas no servidor antes
+            # do exec, para o novo processo não receber este mesmo callback
+            reinicio_solicitado.set()
+            bot.stop_polling()
         
         elif action == "logs":
             # Mostra os logs recentes
             try:
+                # Garante que os registros pendentes já estejam no arquivo
+                drenar_logs()
+                
                 # Lê as últimas 50 linhas do arquivo de log
+                # (a deque percorre o arquivo mantendo só as últimas linhas em memória)
                 with open(os.path.join('logs', LOG_FILENAME), 'r') as f:
-                    log_lines = f.readlines()[-50:]
+                    log_lines = list(collections.deque(f, maxlen=50))
                 
                 # Formata os logs para mostrar ao usuário
                 logs_text = "📋 *Últimos logs do sistema*\n\n```\n"
@@ -2095,7 +2850,7 @@ def main():
                 bot.send_message(user_id, logs_text, parse_mode='Markdown')
                 
                 # Envia um arquivo com logs mais detalhados
-                with open(os.path.join('logs', LOG_FILENAME), 'rb') as f:
+                with open(os.path.join('logs', LOG_FILENAME), 'rb', buffering=1 << 20) as f:
                     bot.send_document(user_id, f, caption="📊 Arquivo de log completo")
             except Exception as e:
                 bot.send_message(user_id, f"❌ Erro ao obter logs: {str(e)}")
@@ -2103,57 +2858,87 @@ def main():
     # Loop principal de polling com tratamento de erros e reinicialização
     max_retries = 10
     retry_count = 0
-    retry_delay = 5  # segundos inicial
+    POLLING_ESTAVEL = 300  # segundos de polling sem erro que zeram a contagem
+    RETRY_DELAY_INICIAL = 5  # segundos
+    retry_delay = RETRY_DELAY_INICIAL
     
     while bot_monitor.running and retry_count < max_retries:
         try:
-            # Mantém o bot ativo com tratamento de erros aprimorado
+            # Mantém o bot ativo com tratamento de erros aprimorado.
+            # non_stop=False: os erros chegam a este loop, que aplica o backoff
+            # por tipo de erro, em vez de serem engolidos pela biblioteca
             logger.info("Bot polling iniciado - monitoramento 24/7 ativo")
-            bot.polling(none_stop=True, timeout=120, interval=1, long_polling_timeout=60)
-            # Se chegou aqui, o polling encerrou normalmente
-            break
+            inicio_polling = time.monotonic()
+            registro_erros_polling.ultimo_erro = None
+            bot.polling(non_stop=False, timeout=POLLING_TIMEOUT, interval=0, long_polling_timeout=LONG_POLLING_TIMEOUT)
+            # Encerramento pedido (sinal ou reinício pelo administrador): sai do loop
+            if not bot_monitor.running or reinicio_solicitado.is_set():
+                break
+            # Caso contrário a biblioteca parou por um erro da API que ela mesma
+            # tratou: segue pelo mesmo tratamento das exceções abaixo
+            raise registro_erros_polling.ultimo_erro or RuntimeError("Polling encerrado sem erro informado")
+        except KeyboardInterrupt:
+            # Interrupção manual: sobe direto para o __main__, sem contar como falha
+            raise
         except Exception as e:
+            # Agora todo erro chega aqui: o limite conta só falhas seguidas, então
+            # um polling que funcionou por um bom tempo recomeça a contagem e o
+            # atraso (só assim o backoff volta ao início)
+            if time.monotonic() - inicio_polling > POLLING_ESTAVEL:
+                retry_count = 0
+                retry_delay = RETRY_DELAY_INICIAL
             retry_count += 1
-            logger.error(f"Erro no polling do bot (tentativa {retry_count}/{max_retries}): {e}")
+            # O texto do erro é montado uma única vez para o log e o monitor
+            err_text = str(e)
+            logger.error("Erro no polling do bot (tentativa %d/%d): %s", retry_count, max_retries, err_text)
             
             # Reporta o erro para o sistema de monitoramento
-            bot_monitor.report_error(str(e))
+            bot_monitor.report_error(err_text)
             
             # Tratamento especializado por tipo de erro
-            if "429" in str(e):  # Too Many Requests
-                logger.warning("Limite de requisições Telegram excedido. Aguardando mais tempo.")
-                retry_delay = min(retry_delay * 2, 60)  # Exponential backoff até 60s
-            elif "401" in str(e):  # Unauthorized (token inválido)
-                logger.critical("Token do bot inválido ou revogado. Encerrando.")
-                break
-            elif "409" in str(e):  # Conflict (outra instância do bot já está rodando)
-                logger.warning("Outro polling já está em execução. Reiniciando...")
-                retry_delay = 10
-            elif isinstance(e, (requests.exceptions.ConnectionError, 
-                                requests.exceptions.ReadTimeout,
-                                requests.exceptions.ChunkedEncodingError)):
-                logger.error(f"Erro de conexão com a API do Telegram: {e}")
-                retry_delay = min(retry_delay * 1.5, 30)  # Aumenta gradualmente até 30s
-            elif isinstance(e, (KeyboardInterrupt, SystemExit)):
-                logger.info("Bot interrompido manualmente.")
+            acao = classificar_erro_polling(e)
+            logger.log(acao.nivel, acao.mensagem, err_text)
+            if acao.terminal:
+                # Erro definitivo (token revogado): não há o que esperar nem testar
                 break
+            if acao.atraso_fixo is not None:
+                retry_delay = acao.atraso_fixo
             else:
-                # Outros erros não categorizados
-                logger.error(f"Erro não categorizado: {e}")
+                retry_delay = min(retry_delay * acao.fator, acao.limite)
             
-            # Tempo de espera antes de tentar novamente
-            logger.info(f"Tentando reiniciar o polling em {retry_delay} segundos...")
-            time.sleep(retry_delay)
+            # Após uma falha de rede, se o servidor já aceita conexões a espera
+            # desta vez é curta; o atraso acumulado não é zerado. Erros da API
+            # (429, 409) sempre esperam o backoff completo: a rede está no ar
+            espera = retry_delay
+            if acao is ACAO_POLLING_CONEXAO:
+                if rede_disponivel():
+                    logger.info("Conexão com o Telegram disponível novamente")
+                    espera = min(retry_delay, RETRY_DELAY_INICIAL)
+                else:
+                    logger.error("Não foi possível estabelecer conexão com o Telegram")
             
-            # Tenta restabelecer a conexão com o bot
-            try:
-                bot.get_me()  # Testa a conexão com o Telegram
-                logger.info("Conexão com o Telegram estabelecida com sucesso")
-            except Exception as conn_err:
-                logger.error(f"Não foi possível estabelecer conexão com o Telegram: {conn_err}")
+            # Tempo de espera antes de tentar novamente, com jitter para que
+            # vários bots não voltem todos no mesmo instante após uma queda
+            logger.info("Tentando reiniciar o polling em até %.1f segundos...", espera)
+            time.sleep(obter_rng().uniform(espera * 0.5, espera))
+    
+    if reinicio_solicitado.is_set():
+        # Confirma no servidor as atualizações já recebidas (incluindo o callback
+        # que pediu o reinício): o novo processo começa pelas seguintes. Handlers
+        # ainda em execução neste momento são interrompidos pelo exec
+        try:
+            bot.get_updates(offset=bot.last_update_id + 1, timeout=10, long_polling_timeout=0)
+        except Exception as e:
+            logger.error("Erro ao confirmar as atualizações antes do reinício: %s", e)
+        try:
+            reiniciar_processo()
+        except OSError as e:
+            reinicio_solicitado.clear()
+            logger.error("Erro ao reiniciar via comando de administrador: %s", e)
+            raise
     
     if retry_count >= max_retries:
-        logger.critical(f"Número máximo de tentativas ({max_retries}) excedido. Encerrando o bot.")
+        logger.critical("Número máximo de tentativas (%d) excedido. Encerrando o bot.", max_retries)
         sys.exit(1)
 
 if __name__ == '__main__':
@@ -2169,11 +2954,23 @@ if __name__ == '__main__':
         # Start the bot com mecanismo anti-crash
         logger.info("Iniciando bot Telegram com proteção anti-falhas...")
         
-        retry_count = 0
+        # Limite de falhas numa janela móvel: um crash loop encerra o processo
+        # para o watchdog, mas falhas espaçadas ao longo de semanas não
+        # O histórico passa de um processo para o próximo pela variável de
+        # ambiente BACBO_FALHAS, já que as falhas repetidas reiniciam o processo
         max_retry = 10
+        JANELA_FALHAS = 3600  # segundos
+        falhas = collections.deque(  # Instantes (time.time) das falhas na janela
+            float(t) for t in os.environ.get('BACBO_FALHAS', '').split(',') if t
+        )
         retry_delay = 30  # segundos
         
-        while retry_count < max_retry:
+        # Após REEXEC_APOS_FALHAS falhas neste processo, reinicia num interpretador
+        # novo em vez de reaproveitar threads e conexões do processo que falhou
+        REEXEC_APOS_FALHAS = 3
+        falhas_processo = 0
+        
+        while True:
             try:
                 main()
                 break  # Se chegou aqui sem erros, sai do loop
@@ -2181,36 +2978,38 @@ if __name__ == '__main__':
                 logger.info("Bot encerrado manualmente")
                 break
             except Exception as e:
-                retry_count += 1
-                logger.critical(f"ERRO FATAL NO BOT (tentativa {retry_count}/{max_retry}): {e}")
+                agora = time.time()
+                falhas.append(agora)
+                falhas_processo += 1
+                while falhas and agora - falhas[0] > JANELA_FALHAS:
+                    falhas.popleft()
+                retry_count = len(falhas)
+                if retry_count > max_retry:
+                    logger.critical("Mais de %d falhas na última hora. Encerrando o programa.", max_retry)
+                    logger.critical("Execute o watchdog para gerenciar reinicializações automaticamente.")
+                    sys.exit(1)
+                logger.critical("ERRO FATAL NO BOT (tentativa %d/%d): %s", retry_count, max_retry, e)
                 logger.critical("Tentando reiniciar em %d segundos...", retry_delay)
                 
-                # Tenta enviar mensagem para admin antes de reiniciar
+                # Tenta enviar mensagem para os admins, em paralelo, antes de reiniciar
                 try:
-                    admin_ids = [6515136130]  # Use o ID do seu admin aqui
-                    for admin_id in admin_ids:
-                        try:
-                            error_msg = f"🚨 *ERRO CRÍTICO* 🚨\n\nO bot sofreu uma falha: `{str(e)}`\n\nTentativa de reinício automático: {retry_count}/{max_retry}"
-                            bot.send_message(admin_id, error_msg, parse_mode='Markdown')
-                        except:
-                            pass  # Ignora erros no envio de notificação
+                    error_msg = ERRO_CRITICO_TEMPLATE.format(erro=e, tentativa=retry_count, maximo=max_retry)
+                    list(NOTIFY_POOL.map(lambda admin_id: enviar_notificacao_segura(admin_id, error_msg), ADMIN_IDS))
                 except:
-                    pass
+                    pass  # Ignora erros no envio de notificação
                 
-                # Espera antes de tentar novamente
-                time.sleep(retry_delay)
+                # Espera antes de tentar novamente (com jitter)
+                time.sleep(obter_rng().uniform(retry_delay * 0.5, retry_delay))
+                
+                if falhas_processo >= REEXEC_APOS_FALHAS:
+                    os.environ['BACBO_FALHAS'] = ','.join(map(str, falhas))
+                    reiniciar_processo()
                 
                 # Aumento exponencial no tempo de espera
                 retry_delay = min(retry_delay * 1.5, 300)  # Máximo de 5 minutos entre tentativas
-        
-        if retry_count >= max_retry:
-            logger.critical(f"Número máximo de tentativas ({max_retry}) excedido. Encerrando o programa.")
-            logger.critical("Execute o watchdog para gerenciar reinicializações automaticamente.")
-            sys.exit(1)
             
     except Exception as final_e:
         # Última linha de defesa contra falhas inesperadas
         logger.critical(f"EXCEÇÃO NÃO TRATADA: {final_e}")
-        import traceback
         logger.critical(f"Traceback completo: {traceback.format_exc()}")
         sys.exit(1)
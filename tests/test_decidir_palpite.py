@@ -0,0 +1,31 @@
+import itertools
+
+import pytest
+
+pytest.importorskip("telebot")
+pytest.importorskip("dotenv")
+
+from main import Cor, P_LA, P_LA_AZ, P_LA_VM, decidir_palpite
+
+CORES = (Cor.AZUL, Cor.VERMELHO, Cor.LARANJA)
+
+
+def test_madrugada_defensiva_mantem_laranja_sem_variacao():
+    # Sequências sem 3 iguais e sem cor ausente chegam à estratégia do período
+    ultimos_validos = [
+        u for u in itertools.product(CORES, repeat=5)
+        if not (u[-1] == u[-2] == u[-3]) and set(u) == set(CORES)
+    ]
+    for ultimos in ultimos_validos:
+        for hora in range(6):
+            for ultimo_palpite in (None, P_LA, P_LA_AZ, P_LA_VM):
+                palpite, variar, _ = decidir_palpite(ultimos, Cor.AZUL, True, hora, 5, ultimo_palpite)
+                assert palpite is P_LA
+                assert variar is False
+
+
+def test_madrugada_normal_varia_ao_repetir():
+    ultimos = (Cor.AZUL, Cor.VERMELHO, Cor.AZUL, Cor.LARANJA, Cor.VERMELHO)
+    palpite, variar, _ = decidir_palpite(ultimos, Cor.AZUL, False, 2, 5, P_LA_AZ)
+    assert palpite is P_LA_AZ
+    assert variar is True